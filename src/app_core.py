@@ -116,7 +116,7 @@ class WeatherEngine:
                         name=station_dict.get("name", ""),
                         country=station_dict.get("country", ""),
                     )
-                    self.station_db.stations[station.icao] = station
+                    self.station_db.add_station(station)
                 except Exception as e:
                     logger.warning(f"Error loading station {station_dict.get('icao', 'unknown')}: {e}")
             logger.info(f"Loaded {len(stations_data)} stations from file")
@@ -766,7 +766,7 @@ class WeatherEngine:
         # For clouds, use the closest station's clouds (too complex to blend)
         if station_weathers:
             closest = min(station_weathers, key=lambda sw: sw['distance'])
-            blended['clouds'] = closest['weather'].clouds.copy() if closest['weather'].clouds else []
+            blended['clouds'] = closest['weather'].cloud_dicts()
         
         # For weather tokens, collect from all stations (union)
         all_tokens = set()
@@ -1036,5 +1036,7 @@ class WeatherEngine:
     
     def shutdown(self) -> None:
         """Shutdown engine."""
+        if self.injector and hasattr(self.injector, 'disconnect'):
+            self.injector.disconnect()
         if self.fsuipc_bridge:
             self.fsuipc_bridge.disconnect()
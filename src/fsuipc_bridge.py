@@ -1,5 +1,7 @@
 """FSUIPC integration for FSX."""
 
+import logging
+import math
 import sys
 import time
 from pathlib import Path
@@ -22,10 +24,42 @@ except (ImportError, OSError, ModuleNotFoundError) as e:
 from src.config import FSUIPCConfig
 from src.utils import require_32bit_python
 
+logger = logging.getLogger(__name__)
+
+# Offsets read on every aircraft state poll (prepared once per connection)
+# According to FSUIPC documentation, lat/lon/alt are 64-bit integers that need
+# to be split into high and low 32-bit parts for proper conversion
+# Latitude: low 32 bits (unsigned) at 0x0560, high 32 bits (signed) at 0x0564
+# Longitude: low 32 bits (unsigned) at 0x0568, high 32 bits (signed) at 0x056C
+_FSUIPC_OFFSETS = (
+    (0x560, "u"),  # Latitude low 32 bits (unsigned)
+    (0x564, "d"),  # Latitude high 32 bits (signed)
+    (0x568, "u"),  # Longitude low 32 bits (unsigned)
+    (0x56C, "d"),  # Longitude high 32 bits (signed)
+    (0x570, "u"),  # Altitude low 32 bits (unsigned, fractional metres)
+    (0x574, "d"),  # Altitude high 32 bits (signed, integer metres)
+    (0x2B4, "u"),  # Ground speed (32-bit unsigned int, metres/sec * 65536)
+    (0x2B8, "d"),  # Vertical speed (32-bit signed int, feet/min * 256)
+    (0x580, "u"),  # True Heading (32-bit unsigned)
+    (0x2A0, "h"),  # Magnetic Variation (16-bit signed)
+    (0x366, "H"),  # On ground (16-bit unsigned, 1 = on ground)
+)
+
+# Unit conversion factors for the raw FSUIPC values
+_LO_SCALE = 1.0 / (65536.0 * 65536.0)  # Low 32-bit part -> fraction of high part
+_LAT_DEG = 90.0 / 10001750.0  # Combined latitude units -> degrees
+_LON_DEG = 360.0 * _LO_SCALE  # Combined longitude units -> degrees
+_HDG_DEG = 360.0 * _LO_SCALE  # 32-bit heading units -> degrees
+_MAGVAR_DEG = 360.0 / 65536.0  # 16-bit magnetic variation units -> degrees
+_M_TO_FT = 3.28084  # Metres -> feet
+_MPS_TO_KT = 1.94384  # Metres/sec -> knots
+
 
 class AircraftState:
     """Aircraft state data."""
     
+    __slots__ = ("lat", "lon", "alt_ft", "gs_kt", "vs_fpm", "heading_deg", "on_ground")
+    
     def __init__(self):
         self.lat: float = 0.0
         self.lon: float = 0.0
@@ -54,11 +88,16 @@ class FSUIPCBridge:
     def __init__(self, config: FSUIPCConfig):
         self.config = config
         self.connection: Optional[FSUIPC] = None
+        self._prepared = None  # PreparedData for _FSUIPC_OFFSETS, created on connect
         self.connected = False
         self.dev_mode = config.dev_mode
         self._cached_connection_status = False  # Cached status to prevent flickering
-        self._last_connection_check = 0.0  # Timestamp of last connection check
+        self._last_connection_check = 0.0  # time.monotonic() of last connection check
         self._connection_check_interval = 5.0  # Only check connection status every 5 seconds (prevents flickering)
+        # One-shot debug logging flags for get_aircraft_state()
+        self._debug_logged = False
+        self._latlon_debug_logged = False
+        self._heading_debug_logged = False
         
         # FSUIPC offsets for FSX
         # Latitude: 0x0560 (8 bytes, signed 64-bit, degrees * 2^32 / 360)
@@ -75,8 +114,6 @@ class FSUIPCBridge:
         
         if not FSUIPC_AVAILABLE and not self.dev_mode:
             # Auto-enable DEV mode if FSUIPC is not available
-            import logging
-            logger = logging.getLogger(__name__)
             error_msg = FSUIPC_IMPORT_ERROR if FSUIPC_IMPORT_ERROR else "unknown error"
             logger.warning(f"FSUIPC library not available ({error_msg}).")
             logger.info("Enabling DEV mode automatically.")
@@ -88,7 +125,7 @@ class FSUIPCBridge:
         if self.dev_mode:
             self.connected = True
             self._cached_connection_status = True  # Update cache
-            self._last_connection_check = time.time()
+            self._last_connection_check = time.monotonic()
             return True
         
         if not FSUIPC_AVAILABLE:
@@ -96,14 +133,15 @@ class FSUIPCBridge:
         
         try:
             self.connection = FSUIPC()
+            self._prepared = self.connection.prepare_data(list(_FSUIPC_OFFSETS), True)
             self.connected = True
             self._cached_connection_status = True  # Update cache
-            self._last_connection_check = time.time()
+            self._last_connection_check = time.monotonic()
             return True
         except FSUIPCException as e:
             self.connected = False
             self._cached_connection_status = False  # Update cache
-            self._last_connection_check = time.time()
+            self._last_connection_check = time.monotonic()
             return False
     
     def reconnect(self) -> bool:
@@ -111,7 +149,7 @@ class FSUIPCBridge:
         self.disconnect()
         result = self.connect()
         # Force cache update after reconnect attempt
-        self._last_connection_check = time.time()
+        self._last_connection_check = time.monotonic()
         return result
     
     def disconnect(self) -> None:
@@ -122,20 +160,22 @@ class FSUIPCBridge:
             except:
                 pass
             self.connection = None
+        self._prepared = None
         self.connected = False
         self._cached_connection_status = False  # Update cache
-        self._last_connection_check = time.time()
+        self._last_connection_check = time.monotonic()
     
     def is_connected(self) -> bool:
         """Check if connected - verify both flag and connection object.
         
-        Uses cached status to prevent flickering - only checks every 2 seconds.
+        Uses cached status to prevent flickering - only checks every 5 seconds
+        (measured on the monotonic clock, so wall-clock adjustments don't matter).
         """
         if self.dev_mode:
             return self.connected
         
-        # Use cached status to prevent flickering (only update every 2 seconds)
-        current_time = time.time()
+        # Use cached status to prevent flickering (only update every 5 seconds)
+        current_time = time.monotonic()
         if current_time - self._last_connection_check < self._connection_check_interval:
             return self._cached_connection_status
         
@@ -143,10 +183,7 @@ class FSUIPCBridge:
         self._last_connection_check = current_time
         try:
             # Verify both the flag and that connection object exists
-            new_status = self.connected and self.connection is not None
-            # Only update cache if status actually changed (prevents flickering)
-            if new_status != self._cached_connection_status:
-                self._cached_connection_status = new_status
+            self._cached_connection_status = self.connected and self.connection is not None
             return self._cached_connection_status
         except Exception:
             # On any error, assume disconnected
@@ -164,48 +201,23 @@ class FSUIPCBridge:
             # Return simulated data in DEV mode
             return self._get_dev_state()
         
-        if not self.connected or not self.connection:
+        if not self.connected or not self.connection or not self._prepared:
             return None
         
         try:
-            # Prepare data for reading
-            # According to FSUIPC documentation, lat/lon/alt are 64-bit integers that need
-            # to be split into high and low 32-bit parts for proper conversion
-            # For 32-bit systems, lat/lon are split into high and low 32-bit parts
-            # Latitude: low 32 bits (unsigned) at 0x0560, high 32 bits (signed) at 0x0564
-            # Longitude: low 32 bits (unsigned) at 0x0568, high 32 bits (signed) at 0x056C
-            prepared = self.connection.prepare_data([
-                (0x560, "u"),  # Latitude low 32 bits (unsigned)
-                (0x564, "d"),  # Latitude high 32 bits (signed)
-                (0x568, "u"),  # Longitude low 32 bits (unsigned)
-                (0x56C, "d"),  # Longitude high 32 bits (signed)
-                (0x570, "u"),  # Altitude low 32 bits (unsigned, fractional metres)
-                (0x574, "d"),  # Altitude high 32 bits (signed, integer metres)
-                (0x2B4, "u"),  # Ground speed (32-bit unsigned int, metres/sec * 65536)
-                (0x2B8, "d"),  # Vertical speed (32-bit signed int, feet/min * 256)
-                (0x580, "u"),  # True Heading (32-bit unsigned)
-                (0x2A0, "h"),  # Magnetic Variation (16-bit signed)
-                (0x366, "H"),  # On ground (16-bit unsigned, 1 = on ground)
-            ], True)
-            
-            data = prepared.read()
+            # Read the offsets prepared in connect() (see _FSUIPC_OFFSETS)
+            data = self._prepared.read()
             
             # Ensure we have enough data elements
             if len(data) < 11:
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.error(f"FSUIPC returned insufficient data: expected 11 elements, got {len(data)}")
                 return None
             
             # Debug: log raw values and types (first time only, debug level)
-            if not hasattr(self, '_debug_logged'):
-                import logging
-                logger = logging.getLogger(__name__)
+            if not self._debug_logged and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"FSUIPC raw values: lat={data[0]}/{data[1]}, lon={data[2]}/{data[3]}, alt={data[4]}/{data[5]}, gs={data[6]}, hdg={data[8]}")
                 self._debug_logged = True
             
-            state = AircraftState()
-            
             # Convert FSUIPC values to standard units
             # For 32-bit systems, lat/lon are split into high and low 32-bit parts
             
@@ -217,17 +229,14 @@ class FSUIPCBridge:
             dHi_lat = float(lat_high)
             dLo_lat = float(lat_low)
             
-            # Divide low part by (65536.0 * 65536.0) to give it proper magnitude
-            dLo_lat = dLo_lat / (65536.0 * 65536.0)
+            # Scale low part by 1 / (65536.0 * 65536.0) to give it proper magnitude
+            dLo_lat = dLo_lat * _LO_SCALE
             
             # Add or subtract according to whether dHi is positive or negative
-            if dHi_lat >= 0:
-                lat_combined = dHi_lat + dLo_lat
-            else:
-                lat_combined = dHi_lat - dLo_lat
+            lat_combined = dHi_lat + math.copysign(dLo_lat, dHi_lat)
             
             # Multiply by 90.0 / 10001750.0 to get degrees
-            state.lat = lat_combined * 90.0 / 10001750.0
+            lat = lat_combined * _LAT_DEG
             
             # Longitude: combine high and low 32-bit parts
             # High 32 bits (signed) at 0x056C, low 32 bits (unsigned) at 0x0568
@@ -238,44 +247,38 @@ class FSUIPCBridge:
             dHi_lon = float(lon_high)
             dLo_lon = float(lon_low)
             
-            # Divide low part by (65536.0 * 65536.0) to give it proper magnitude
-            dLo_lon = dLo_lon / (65536.0 * 65536.0)
+            # Scale low part by 1 / (65536.0 * 65536.0) to give it proper magnitude
+            dLo_lon = dLo_lon * _LO_SCALE
             
             # Add or subtract according to whether dHi is positive or negative
-            if dHi_lon >= 0:
-                lon_combined = dHi_lon + dLo_lon
-            else:
-                lon_combined = dHi_lon - dLo_lon
+            lon_combined = dHi_lon + math.copysign(dLo_lon, dHi_lon)
             
             # Multiply by 360.0 / (65536.0 * 65536.0) to get degrees
             # Negative result is West, positive is East
-            state.lon = lon_combined * 360.0 / (65536.0 * 65536.0)
+            lon = lon_combined * _LON_DEG
             
             # Debug: log raw values on first read to diagnose issues (only in debug mode)
-            if not hasattr(self, '_latlon_debug_logged'):
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.debug(f"Lat/Lon conversion: lat={state.lat:.6f}, lon={state.lon:.6f}")
+            if not self._latlon_debug_logged and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Lat/Lon conversion: lat={lat:.6f}, lon={lon:.6f}")
                 self._latlon_debug_logged = True
             
-            # Validate lat/lon
-            if abs(state.lat) < 0.0001 and abs(state.lon) < 0.0001:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Lat/lon are essentially zero - may indicate uninitialized data or wrong conversion")
-                logger.warning(f"Raw values: lat_low={lat_low}, lat_high={lat_high}, lon_low={lon_low}, lon_high={lon_high}")
-                # If raw values are also zero, data is likely uninitialized - return None
-                if lat_low == 0 and lat_high == 0 and lon_low == 0 and lon_high == 0:
-                    logger.error("All lat/lon raw values are zero - FSX may not be running or data is uninitialized")
-                    return None
-                # Otherwise, continue with the zero values (might be valid if at 0,0)
-            elif state.lat < -90 or state.lat > 90 or state.lon < -180 or state.lon > 180:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Converted lat/lon out of range: lat={state.lat}, lon={state.lon}")
+            # Validate lat/lon (common case: in range and away from 0,0)
+            lat_abs = abs(lat)
+            lon_abs = abs(lon)
+            if lat_abs <= 90.0 and lon_abs <= 180.0:
+                if lat_abs < 0.0001 and lon_abs < 0.0001:
+                    logger.warning(f"Lat/lon are essentially zero - may indicate uninitialized data or wrong conversion")
+                    logger.warning(f"Raw values: lat_low={lat_low}, lat_high={lat_high}, lon_low={lon_low}, lon_high={lon_high}")
+                    # If raw values are also zero, data is likely uninitialized - return None
+                    if lat_low == 0 and lat_high == 0 and lon_low == 0 and lon_high == 0:
+                        logger.error("All lat/lon raw values are zero - FSX may not be running or data is uninitialized")
+                        return None
+                    # Otherwise, continue with the zero values (might be valid if at 0,0)
+            else:
+                logger.warning(f"Converted lat/lon out of range: lat={lat}, lon={lon}")
                 logger.warning(f"Raw values: lat_low={lat_low}, lat_high={lat_high}, lon_low={lon_low}, lon_high={lon_high}")
                 # If way out of range, data might be uninitialized
-                if abs(state.lat) > 1000 or abs(state.lon) > 1000:
+                if lat_abs > 1000 or lon_abs > 1000:
                     logger.error("Values are way out of range - FSX may not be running or data is uninitialized")
                     return None
             
@@ -289,25 +292,23 @@ class FSUIPCBridge:
             dHi_alt = float(alt_high)  # Integer metres
             dLo_alt = float(alt_low)   # Fractional metres
             
-            # Divide low part by (65536.0 * 65536.0) to give it proper magnitude
-            dLo_alt = dLo_alt / (65536.0 * 65536.0)
+            # Scale low part by 1 / (65536.0 * 65536.0) to give it proper magnitude
+            dLo_alt = dLo_alt * _LO_SCALE
             
             # Combine: integer metres + fractional metres
             alt_meters = dHi_alt + dLo_alt
             
             # Convert to feet
-            state.alt_ft = alt_meters * 3.28084
+            alt_ft = alt_meters * _M_TO_FT
             
             # Ground speed: stored as metres/sec * 65536 (32-bit unsigned)
             # Convert: (raw / 65536) * 1.94384 = knots
-            gs_raw = data[6]
-            if gs_raw < 0:
-                gs_raw = gs_raw + 2**32  # Handle as unsigned
+            gs_raw = data[6] & 0xFFFFFFFF  # Handle as unsigned
             gs_mps = float(gs_raw) / 65536.0  # metres per second
-            state.gs_kt = gs_mps * 1.94384  # Convert to knots
+            gs_kt = gs_mps * _MPS_TO_KT  # Convert to knots
             
             # Vertical speed: stored as feet/min * 256, so fpm = value / 256
-            state.vs_fpm = float(data[7]) / 256.0
+            vs_fpm = float(data[7]) / 256.0
             
             # Heading: 0x0580 is True Heading (32-bit unsigned)
             # Convert using: degrees = value * 360 / (65536 * 65536)
@@ -320,10 +321,9 @@ class FSUIPCBridge:
             # Convert true heading (32-bit unsigned)
             if isinstance(heading_raw, int):
                 # Handle as unsigned 32-bit
-                if heading_raw < 0:
-                    heading_raw = heading_raw + 2**32
+                heading_raw &= 0xFFFFFFFF
                 # Use (65536 * 65536) for heading conversion
-                true_heading = (float(heading_raw) * 360.0) / (65536.0 * 65536.0)
+                true_heading = float(heading_raw) * _HDG_DEG
             else:
                 true_heading = float(heading_raw)
             
@@ -331,41 +331,45 @@ class FSUIPCBridge:
             # Stored as: degrees * 65536 / 360
             # So: degrees = value * 360 / 65536
             if isinstance(mag_var_raw, int):
-                # Handle as signed 16-bit
-                if mag_var_raw >= 2**15:
-                    mag_var_raw = mag_var_raw - 2**16
-                mag_var = (float(mag_var_raw) * 360.0) / 65536.0
+                # Handle as signed 16-bit (sign-extend the low 16 bits)
+                mag_var_raw = ((mag_var_raw & 0xFFFF) ^ 0x8000) - 0x8000
+                mag_var = float(mag_var_raw) * _MAGVAR_DEG
             else:
                 mag_var = float(mag_var_raw) if mag_var_raw else 0.0
             
             # Debug: log heading conversion (only in debug mode)
-            if not hasattr(self, '_heading_debug_logged'):
-                import logging
-                logger = logging.getLogger(__name__)
+            if not self._heading_debug_logged and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Heading conversion: true={true_heading:.1f}°, mag_var={mag_var:.1f}°, magnetic={true_heading - mag_var:.1f}°")
                 self._heading_debug_logged = True
             
             # Calculate magnetic heading: magnetic = true - variation
             # Note: West variation is negative, so subtracting it adds to the heading
-            state.heading_deg = true_heading - mag_var
-            
-            # Normalize heading to 0-360
-            while state.heading_deg < 0:
-                state.heading_deg += 360.0
-            while state.heading_deg >= 360.0:
-                state.heading_deg -= 360.0
+            # Normalize heading to 0-360 (float % is non-negative for a positive divisor,
+            # but a tiny negative input can round up to exactly 360.0)
+            heading = (true_heading - mag_var) % 360.0
+            heading_deg = heading if heading < 360.0 else 0.0
             
             # On ground: 1 = on ground (offset 0x0366)
             on_ground_raw = data[10]
-            state.on_ground = (on_ground_raw & 1) != 0
+            on_ground = (on_ground_raw & 1) != 0
             
+            # Build the result only after validation, so callers on other threads
+            # (engine loop, web routes) never see a partially updated state
+            state = AircraftState()
+            state.lat = lat
+            state.lon = lon
+            state.alt_ft = alt_ft
+            state.gs_kt = gs_kt
+            state.vs_fpm = vs_fpm
+            state.heading_deg = heading_deg
+            state.on_ground = on_ground
             return state
             
         except FSUIPCException as e:
             # Connection lost - try to reconnect once
             self.connected = False
             self._cached_connection_status = False  # Update cache
-            self._last_connection_check = time.time()
+            self._last_connection_check = time.monotonic()
             if self.config.auto_reconnect:
                 try:
                     if self.reconnect():
@@ -376,8 +380,6 @@ class FSUIPCBridge:
             return None
         except Exception as e:
             # Other error
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error reading aircraft state: {e}")
             return None
     
@@ -1,10 +1,17 @@
 """Main entry point with system tray support."""
 
 import asyncio
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
 import signal
+import subprocess
 import sys
 import threading
 import time
+import webbrowser
 from pathlib import Path
 
 try:
@@ -17,22 +24,71 @@ except ImportError:
 import uvicorn
 
 from src.config import AppConfig
-from src.web_app import app
+from src.web_app import app, engine_ready
 
 # Global server instance for graceful shutdown
 server_instance = None
 shutdown_event = threading.Event()
 tray_icon = None
 
+# Log record format shared by all log files
+LOG_FORMAT = '%(asctime)s - %(levelname)s:%(name)s:%(message)s'
+LOG_FORMATTER = logging.Formatter(LOG_FORMAT)
+# QueueHandler stores its formatted output as the record message; keep it to the
+# bare message so LOG_FORMAT is only applied once, by the file handler
+_QUEUE_FORMATTER = logging.Formatter('%(message)s')
+
+# Background threads writing queued log records to files (stopped on exit)
+log_listeners = []
+
 
 # All console-related functions removed - using file logging only
 
 
-def create_tray_icon():
+def create_queued_file_handler(log_file: str, level: int = logging.NOTSET) -> logging.Handler:
+    """Create a handler that writes to a log file from a background thread.
+    
+    Logging calls only put the record on a queue; a QueueListener thread owns
+    the FileHandler and does the actual disk writes.
+    """
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(LOG_FORMATTER)
+    file_handler.setLevel(level)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(_QUEUE_FORMATTER)
+    queue_handler.setLevel(level)
+    
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    log_listeners.append(listener)
+    return queue_handler
+
+
+def stop_log_listeners():
+    """Write out queued log records and stop the log writer threads."""
+    while log_listeners:
+        listener = log_listeners.pop()
+        try:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        except Exception:
+            pass
+
+
+atexit.register(stop_log_listeners)
+
+
+def create_tray_icon(config: AppConfig):
     """Create system tray icon."""
     if not TRAY_AVAILABLE:
         return None
     
+    # Resolved once; the server keeps serving on this host/port until restarted
+    url = f"http://{config.web_ui.host}:{config.web_ui.port}"
+    
     # Create a simple icon
     image = Image.new('RGB', (64, 64), color='blue')
     draw = ImageDraw.Draw(image)
@@ -44,12 +100,16 @@ def create_tray_icon():
         shutdown_event.set()
         if tray_icon:
             # Stop icon in a separate thread to avoid callback issues
-            threading.Thread(target=lambda: tray_icon.stop(), daemon=True).start()
+            threading.Thread(target=tray_icon.stop, daemon=True).start()
+    
+    def on_open_web_ui():
+        """Open the web UI from the menu."""
+        open_browser(url)
     
     # Create menu (no console toggle - logs are in files)
     menu = pystray.Menu(
-        pystray.MenuItem("Open Web UI", lambda: open_browser()),
-        pystray.MenuItem("View Logs", lambda: open_logs_folder()),
+        pystray.MenuItem("Open Web UI", on_open_web_ui),
+        pystray.MenuItem("View Logs", open_logs_folder),
         pystray.Menu.SEPARATOR,
         pystray.MenuItem("Exit", on_exit),
     )
@@ -58,18 +118,13 @@ def create_tray_icon():
     return icon
 
 
-def open_browser():
+def open_browser(url: str):
     """Open web browser to UI."""
-    import webbrowser
-    config = AppConfig.load()
-    url = f"http://{config.web_ui.host}:{config.web_ui.port}"
     webbrowser.open(url)
 
 
 def open_logs_folder():
     """Open the logs folder in Windows Explorer."""
-    import os
-    import subprocess
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     if sys.platform == 'win32':
         subprocess.Popen(f'explorer "{log_dir}"')
@@ -85,7 +140,6 @@ def exit_app():
     """Exit application gracefully."""
     global server_instance, shutdown_event
     
-    import logging
     logger = logging.getLogger(__name__)
     logger.info("Shutting down...")
     
@@ -102,6 +156,8 @@ def exit_app():
         except Exception as e:
             logger.error(f"Error shutting down server: {e}")
     
+    stop_log_listeners()
+    
     # Exit
     sys.exit(0)
 
@@ -112,9 +168,6 @@ def run_server(config: AppConfig):
     
     # Fix sys.stdout/stderr if they're None (happens when running without console)
     # Uvicorn needs these to be valid file-like objects
-    import sys
-    import os
-    import logging
     
     # Set up log directory
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
@@ -147,17 +200,13 @@ def run_server(config: AppConfig):
     
     # Add file handler for server thread logging
     server_log_file = os.path.join(log_dir, 'server.log')
-    file_handler = logging.FileHandler(server_log_file, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s:%(name)s:%(message)s'))
-    file_handler.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(create_queued_file_handler(server_log_file, logging.INFO))
     
     # Set up logging in this thread
     logger = logging.getLogger(__name__)
     logger.info("run_server() called - starting uvicorn in background thread")
     
     # Set custom exception handler for asyncio to suppress harmless Windows errors
-    import sys
     if sys.platform == 'win32':
         def custom_exception_handler(loop, context):
             """Suppress harmless Windows WebSocket connection cleanup errors."""
@@ -184,8 +233,6 @@ def run_server(config: AppConfig):
         pass
     
     try:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info("Creating uvicorn config...")
         config_obj = uvicorn.Config(
             app,
@@ -194,7 +241,6 @@ def run_server(config: AppConfig):
             log_level="info",
         )
         logger.info("Creating uvicorn Server instance...")
-        global server_instance
         server_instance = uvicorn.Server(config_obj)
         logger.info("Uvicorn Server instance created")
         
@@ -204,15 +250,9 @@ def run_server(config: AppConfig):
         server_instance.run()
         logger.info("Uvicorn server stopped")
     except KeyboardInterrupt:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info("Server interrupted by user")
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Server error: {e}", exc_info=True)
-        import traceback
-        logger.error(traceback.format_exc())
 
 
 def main():
@@ -220,8 +260,6 @@ def main():
     global shutdown_event
     
     # Set up logging to file only (no console)
-    import logging
-    import os
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     
@@ -247,9 +285,8 @@ def main():
     # Configure logging to file only (no console)
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s:%(name)s:%(message)s',
         handlers=[
-            logging.FileHandler(log_file, encoding='utf-8')
+            create_queued_file_handler(log_file)
         ],
         force=True
     )
@@ -287,30 +324,23 @@ def main():
     # Wait for server to fully start and FastAPI startup event to complete
     logger.info("Waiting for FastAPI to initialize...")
     
-    # Wait for server to start and startup event to complete
-    # Check if engine is created (startup event should create it)
+    # Wait for the FastAPI startup event to signal that the engine exists, in short
+    # slices so a server thread that dies early (e.g. port in use) is noticed at once
     max_wait = 20  # Maximum 20 seconds
     wait_interval = 0.5
-    waited = 0
+    started = time.monotonic()
     server_ready = False
-    
-    while waited < max_wait:
-        # Check if thread is still alive
+    while True:
+        server_ready = engine_ready.wait(timeout=wait_interval)
+        elapsed = time.monotonic() - started
+        if server_ready:
+            logger.info(f"WeatherEngine detected after {elapsed:.1f}s - FastAPI startup completed successfully")
+            break
         if not server_thread.is_alive():
-            logger.error(f"Server thread died after {waited:.1f} seconds!")
+            logger.error(f"Server thread died after {elapsed:.1f} seconds!")
+            break
+        if elapsed >= max_wait:
             break
-        
-        try:
-            from src.web_app import engine
-            if engine is not None:
-                logger.info(f"WeatherEngine detected after {waited:.1f}s - FastAPI startup completed successfully")
-                server_ready = True
-                break
-        except Exception as e:
-            if waited % 2 == 0:  # Log every second
-                logger.debug(f"Waiting for engine... ({waited:.1f}s, thread alive: {server_thread.is_alive()})")
-        time.sleep(wait_interval)
-        waited += wait_interval
     
     if not server_ready:
         logger.error(f"FastAPI startup event did not complete - WeatherEngine not detected after {max_wait} seconds!")
@@ -330,7 +360,7 @@ def main():
             except Exception:
                 pass
         try:
-            tray_icon = create_tray_icon()
+            tray_icon = create_tray_icon(config)
             if tray_icon:
                 # Run icon in a separate thread (non-blocking)
                 def run_icon():
@@ -349,9 +379,10 @@ def main():
             logger.error(f"Error creating tray icon: {e}", exc_info=True)
         
         # Wait for shutdown event (don't block on tray icon)
+        # Bounded waits so Ctrl+C is still delivered on Windows
         try:
-            while not shutdown_event.is_set():
-                time.sleep(0.1)
+            while not shutdown_event.wait(timeout=1.0):
+                pass
         except KeyboardInterrupt:
             shutdown_event.set()
         
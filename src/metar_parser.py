@@ -1,12 +1,62 @@
 """METAR parser - pragmatic parsing for weather injection."""
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+# METARs are parsed in a single pass over whitespace-separated tokens.
+# The patterns below are matched against one token at a time.
+
+# Visibility in SM or fractional, right after the wind token: e.g., "10SM", "1/2SM", "M1/4SM"
+_VIS_SM_RE = re.compile(r'(\d{1,2}|\d{1,2}/\d{1,2}|M\d{1,2}/\d{1,2})(SM)?(?:$|[A-Z])')
+# Splits tokens such as "-RA" or "RA/BR" into words for weather code lookup
+_NON_WORD_RE = re.compile(r'\W+')
+
+# Clouds: e.g., "FEW020", "SCT030", "BKN040", "OVC050", "VV008"
+_CLOUD_COVERAGES = frozenset(("FEW", "SCT", "BKN", "OVC"))
+# Weather tokens: e.g., "RA", "SN", "TS", "BR", "FG"
+# Note: + and - are intensity modifiers, not weather codes, so they are not included
+# Maps each code to its canonical (interned literal) string, which is what gets
+# stored, so every parsed report shares the same token objects
+_WEATHER_CODES = {code: code for code in (
+    "RA", "SN", "TS", "BR", "FG", "DZ", "PL", "SG", "GR", "GS", "UP", "HZ", "FU", "VA", "DU", "SA",
+    "PO", "SQ", "FC", "SS", "DS", "IC", "PE", "SH", "BL", "DR", "FZ", "MI", "BC", "PR", "VC", "RE",
+)}
+
+
+def _split_wind(token: str) -> Optional[tuple]:
+    """
+    Split a wind token by position, e.g. "12015KT", "12015G25KT", "VRB05KT".
+    
+    Returns:
+        (direction, speed, gust) strings, gust None when absent, or None if
+        the token is not a wind group
+    """
+    dir_str = token[:3]
+    if dir_str != "VRB" and not (len(dir_str) == 3 and dir_str.isdecimal()):
+        return None
+    speed_str, gust_sep, gust_str = token[3:-2].partition("G")
+    if not (2 <= len(speed_str) <= 3 and speed_str.isdecimal()):
+        return None
+    if not gust_sep:
+        return dir_str, speed_str, None
+    if not (2 <= len(gust_str) <= 3 and gust_str.isdecimal()):
+        return None
+    return dir_str, speed_str, gust_str
+
+
+def _is_temp_value(value: str) -> bool:
+    """Check for a temperature or dewpoint value, e.g. "12" or "M05"."""
+    if value[:1] == "M":
+        value = value[1:]
+    return len(value) == 2 and value.isdecimal()
+
 
 class CloudLayer:
     """Represents a cloud layer."""
     
+    __slots__ = ("coverage", "base_ft")
+    
     def __init__(self, coverage: str, base_ft: int):
         """
         Initialize cloud layer.
@@ -29,6 +79,11 @@ class CloudLayer:
 class ParsedMETAR:
     """Parsed METAR data."""
     
+    __slots__ = (
+        "raw", "icao", "wind_dir_deg", "wind_speed_kt", "wind_gust_kt", "visibility_nm",
+        "temperature_c", "dewpoint_c", "qnh_hpa", "altimeter_inhg", "clouds", "weather_tokens", "valid",
+    )
+    
     def __init__(self, raw: str):
         self.raw = raw
         self.icao: Optional[str] = None
@@ -68,7 +123,16 @@ def parse_metar(raw: str) -> ParsedMETAR:
     Parse METAR string.
     
     This is a pragmatic parser, not a full ICAO-compliant parser.
+    
+    Results are cached by raw string, so repeated calls with the same report
+    return the same ParsedMETAR instance. Callers must not modify it.
     """
+    return _parse_metar_cached(raw)
+
+
+@lru_cache(maxsize=4096)
+def _parse_metar_cached(raw: str) -> ParsedMETAR:
+    """Parse METAR string (memoized by parse_metar)."""
     metar = ParsedMETAR(raw)
     
     if not raw or len(raw) < 10:
@@ -83,13 +147,69 @@ def parse_metar(raw: str) -> ParsedMETAR:
         elif len(parts[0]) == 4:
             metar.icao = parts[0].upper()
     
-    # Wind: e.g., "12015KT", "12015G25KT", "VRB05KT", "00000KT"
-    wind_pattern = r'\b(\d{3}|VRB)(\d{2,3})(G(\d{2,3}))?KT\b'
-    wind_match = re.search(wind_pattern, raw)
-    if wind_match:
-        dir_str = wind_match.group(1)
-        speed_str = wind_match.group(2)
-        gust_str = wind_match.group(4)
+    # Single pass over the tokens; the first match wins for every group except
+    # clouds and weather, which collect all matches in order.
+    wind = None
+    vis_4digit = None
+    vis_sm_match = None
+    temp = None
+    alt_str = None
+    qnh_str = None
+    after_kt = False
+    for token in parts:
+        # The ICAO report terminator "=" sticks to the last group (e.g. "Q1013=")
+        if token.endswith("="):
+            token = token.rstrip("=")
+            if not token:
+                continue
+        if after_kt:
+            # Visibility appears after wind (which ends with KT) and before weather/clouds
+            # 4-digit value, optionally followed by a direction (e.g., "9999", "4000NE")
+            if vis_4digit is None and len(token) >= 4 and token[:4].isdecimal() and (len(token) == 4 or "A" <= token[4] <= "Z"):
+                vis_4digit = token[:4]
+            if vis_sm_match is None:
+                vis_sm_match = _VIS_SM_RE.match(token)
+        after_kt = token.endswith("KT")
+        
+        if after_kt and wind is None:
+            wind = _split_wind(token)
+        
+        head = token[:3]
+        if head in _CLOUD_COVERAGES and token[3:6].isdecimal() and len(token) >= 6:
+            metar.clouds.append(CloudLayer(head, int(token[3:6]) * 100))
+            continue
+        if head[:2] == "VV" and token[2:5].isdecimal() and len(token) >= 5:
+            metar.clouds.append(CloudLayer("VV", int(token[2:5]) * 100))
+            continue
+        
+        if len(token) == 5 and token[1:].isdecimal():
+            if token[0] == "A":
+                if alt_str is None:
+                    alt_str = token[1:]
+                continue
+            if token[0] == "Q":
+                if qnh_str is None:
+                    qnh_str = token[1:]
+                continue
+        
+        if temp is None and "/" in token:
+            temp_str, _, dew_str = token.partition("/")
+            if _is_temp_value(temp_str) and _is_temp_value(dew_str):
+                temp = temp_str, dew_str
+                continue
+        
+        code = _WEATHER_CODES.get(token)
+        if code is not None:
+            metar.weather_tokens.append(code)
+        elif not token.isalnum():
+            for word in _NON_WORD_RE.split(token):
+                code = _WEATHER_CODES.get(word)
+                if code is not None:
+                    metar.weather_tokens.append(code)
+    
+    # Wind
+    if wind:
+        dir_str, speed_str, gust_str = wind
         
         if dir_str == "VRB":
             metar.wind_dir_deg = None  # Variable
@@ -105,66 +225,42 @@ def parse_metar(raw: str) -> ParsedMETAR:
     if "CAVOK" in raw.upper():
         # CAVOK means visibility >= 10km (>= 5.4nm), no significant weather, no clouds below 5000ft
         metar.visibility_nm = 10.0  # Set to 10nm (well above 10km threshold)
-        # No clouds when CAVOK
-        metar.clouds = []
-    else:
-        # Visibility: e.g., "10SM", "1/2SM", "9999" (meters), "M1/4SM", "8000" (meters)
-        # Visibility appears after wind (which ends with KT) and before weather/clouds
-        # First check for 4-digit meter visibility (e.g., "9999", "8000", "0400")
-        # Pattern: after KT, look for 4-digit number (not a date, which would be followed by Z)
-        vis_4digit_pattern = r'KT\s+(\d{4})(?:\s|$|[A-Z])'
-        vis_4digit_match = re.search(vis_4digit_pattern, raw)
-        if vis_4digit_match:
-            # 4-digit value is always in meters (ICAO format)
-            vis_m = float(vis_4digit_match.group(1))
-            if vis_m >= 9999:
-                # "9999" in METAR means "10km or more" (unlimited/good visibility)
-                metar.visibility_nm = 10.0  # Set to 10nm (>= 10km)
+    elif vis_4digit is not None:
+        # 4-digit value is always in meters (ICAO format)
+        vis_m = float(vis_4digit)
+        if vis_m >= 9999:
+            # "9999" in METAR means "10km or more" (unlimited/good visibility)
+            metar.visibility_nm = 10.0  # Set to 10nm (>= 10km)
+        else:
+            metar.visibility_nm = vis_m * 0.000539957  # meters to nm
+    elif vis_sm_match:
+        # Statute miles or fractional visibility
+        vis_str = vis_sm_match.group(1)
+        unit = vis_sm_match.group(2)
+        
+        if "/" in vis_str:
+            # Fractional visibility
+            if vis_str.startswith("M"):
+                # Less than
+                vis_str = vis_str[1:]
+            num_str, den_str = vis_str.split("/")
+            den = float(den_str)
+            if den == 0:
+                # Division by zero - invalid fraction, skip
+                vis_nm = None
             else:
-                metar.visibility_nm = vis_m * 0.000539957  # meters to nm
+                vis_nm = float(num_str) / den
         else:
-            # Check for SM (statute miles) or fractional visibility
-            # Pattern: number or fraction, optionally followed by SM, after KT
-            vis_pattern = r'KT\s+(\d{1,2}|\d{1,2}/\d{1,2}|M\d{1,2}/\d{1,2})(SM)?(?:\s|$|[A-Z])'
-            vis_match = re.search(vis_pattern, raw)
-            if vis_match:
-                vis_str = vis_match.group(1)
-                unit = vis_match.group(2)
-                
-                if "/" in vis_str:
-                    # Fractional visibility
-                    if vis_str.startswith("M"):
-                        # Less than
-                        vis_str = vis_str[1:]
-                    parts = vis_str.split("/")
-                    if len(parts) == 2:
-                        try:
-                            num = float(parts[0])
-                            den = float(parts[1])
-                            if den == 0:
-                                # Division by zero - invalid fraction, skip
-                                vis_nm = None
-                            else:
-                                vis_nm = num / den
-                        except (ValueError, ZeroDivisionError):
-                            # Invalid fraction format or division by zero
-                            vis_nm = None
-                    else:
-                        vis_nm = None
-                else:
-                    vis_nm = float(vis_str)
-                    if not unit:  # Assume meters if no SM (shouldn't happen with this pattern, but just in case)
-                        vis_nm = vis_nm * 0.000539957  # meters to nm
-                
-                if vis_nm is not None:
-                    metar.visibility_nm = vis_nm
-    
-    # Temperature/Dewpoint: e.g., "12/08", "M05/M10"
-    temp_pattern = r'\b(M?\d{2})/(M?\d{2})\b'
-    temp_match = re.search(temp_pattern, raw)
-    if temp_match:
-        temp_str = temp_match.group(1)
-        dew_str = temp_match.group(2)
+            vis_nm = float(vis_str)
+            if not unit:  # Assume meters if no SM (shouldn't happen with this pattern, but just in case)
+                vis_nm = vis_nm * 0.000539957  # meters to nm
+        
+        if vis_nm is not None:
+            metar.visibility_nm = vis_nm
+    
+    # Temperature/Dewpoint
+    if temp:
+        temp_str, dew_str = temp
         
         if temp_str.startswith("M"):
             metar.temperature_c = -float(temp_str[1:])
@@ -176,40 +272,17 @@ def parse_metar(raw: str) -> ParsedMETAR:
         else:
             metar.dewpoint_c = float(dew_str)
     
-    # Altimeter/QNH: e.g., "A2992" (inches), "Q1013" (hPa)
-    alt_pattern = r'\bA(\d{4})\b'
-    alt_match = re.search(alt_pattern, raw)
-    if alt_match:
-        alt_str = alt_match.group(1)
+    # Altimeter/QNH
+    if alt_str is not None:
         # Convert inches Hg to hPa: inHg * 33.8639 = hPa
         inhg = float(alt_str) / 100.0
         metar.altimeter_inhg = inhg
         metar.qnh_hpa = inhg * 33.8639
     
-    qnh_pattern = r'\bQ(\d{4})\b'
-    qnh_match = re.search(qnh_pattern, raw)
-    if qnh_match:
-        qnh_str = qnh_match.group(1)
+    if qnh_str is not None:
         metar.qnh_hpa = float(qnh_str)
         metar.altimeter_inhg = metar.qnh_hpa / 33.8639
     
-    # Clouds: e.g., "FEW020", "SCT030", "BKN040", "OVC050", "VV008"
-    cloud_pattern = r'\b(FEW|SCT|BKN|OVC|VV)(\d{3})(\w+)?\b'
-    cloud_matches = re.finditer(cloud_pattern, raw)
-    for match in cloud_matches:
-        coverage = match.group(1)
-        base_str = match.group(2)
-        base_ft = int(base_str) * 100
-        metar.clouds.append(CloudLayer(coverage, base_ft))
-    
-    # Weather tokens: e.g., "RA", "SN", "TS", "BR", "FG"
-    # Note: + and - are intensity modifiers, not weather codes, so we don't include them in the pattern
-    weather_pattern = r'\b(RA|SN|TS|BR|FG|DZ|PL|SG|GR|GS|UP|HZ|FU|VA|DU|SA|PO|SQ|FC|SS|DS|IC|PE|SH|BL|DR|FZ|MI|BC|PR|VC|RE)\b'
-    weather_matches = re.finditer(weather_pattern, raw)
-    for match in weather_matches:
-        token = match.group(1)
-        metar.weather_tokens.append(token)
-    
     # Mark as valid if we got at least some data
     metar.valid = (
         metar.icao is not None and
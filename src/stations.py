@@ -1,17 +1,36 @@
 """Station database management."""
 
 import csv
+import heapq
+import json
+import math
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from src.utils import haversine_distance
+from src.utils import EARTH_RADIUS_NM, haversine_distance
+
+# Size of the lat/lon grid cells used to index stations (degrees)
+_GRID_CELL_DEG = 1.0
+_GRID_LAT_CELLS = int(180 / _GRID_CELL_DEG)
+_GRID_LON_CELLS = int(360 / _GRID_CELL_DEG)
+
+
+def _grid_cell(lat: float, lon: float) -> Tuple[int, int]:
+    """Get the (lat, lon) grid cell containing a point."""
+    lat_cell = min(max(int(math.floor((lat + 90.0) / _GRID_CELL_DEG)), 0), _GRID_LAT_CELLS - 1)
+    lon_cell = int(math.floor((lon + 180.0) / _GRID_CELL_DEG)) % _GRID_LON_CELLS
+    return lat_cell, lon_cell
 
 
 class Station:
     """Represents a weather station."""
     
+    __slots__ = ("icao", "lat", "lon", "name", "country")
+    
     def __init__(self, icao: str, lat: float, lon: float, name: str, country: str):
-        self.icao = icao.upper()
+        # Interned so the ICAO used as a dict key and on results is one shared object
+        self.icao = sys.intern(icao.upper())
         self.lat = float(lat)
         self.lon = float(lon)
         self.name = name
@@ -47,6 +66,18 @@ class StationDatabase:
         
         self.csv_path = Path(csv_path)
         self.stations: Dict[str, Station] = {}
+        # Coordinate arrays (one entry per station, same order) and a lat/lon grid
+        # of indices into them, used by find_nearest_stations(); rebuilt lazily
+        # when the station set changes.
+        self._index_stale = True
+        self._station_list: List[Station] = []
+        self._lat_rad: List[float] = []
+        self._lon_rad: List[float] = []
+        self._cos_lat: List[float] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        # GeoJSON for the map view, built on first use and dropped when stations change
+        self._geojson: Optional[dict] = None
+        self._geojson_bytes: Optional[bytes] = None
         self._load()
     
     def _load(self) -> None:
@@ -57,24 +88,99 @@ class StationDatabase:
             return
         
         with open(self.csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+            # Plain rows indexed by header position avoid building a dict per row
+            reader = csv.reader(f)
+            header = next(reader, None)
+            columns = {name: i for i, name in enumerate(header or ())}
+            icao_i = columns.get("icao")
+            if icao_i is None:
+                return
+            lat_i = columns.get("lat")
+            lon_i = columns.get("lon")
+            name_i = columns.get("name")
+            country_i = columns.get("country")
+            
+            stations = self.stations
             for row in reader:
                 try:
-                    icao = row.get("icao", "").strip().upper()
+                    icao = row[icao_i].strip().upper()
                     if not icao:
                         continue
+                    icao = sys.intern(icao)
                     
                     station = Station(
                         icao=icao,
-                        lat=float(row.get("lat", 0)),
-                        lon=float(row.get("lon", 0)),
-                        name=row.get("name", "").strip(),
-                        country=row.get("country", "").strip(),
+                        lat=float(row[lat_i]) if lat_i is not None else 0.0,
+                        lon=float(row[lon_i]) if lon_i is not None else 0.0,
+                        name=row[name_i].strip() if name_i is not None else "",
+                        country=row[country_i].strip() if country_i is not None else "",
                     )
-                    self.stations[icao] = station
-                except (ValueError, KeyError) as e:
-                    # Skip invalid rows
+                    stations[icao] = station
+                except (ValueError, IndexError) as e:
+                    # Skip invalid or short rows
                     continue
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """
+        Mark derived data (coordinate index, GeoJSON) as out of date.
+        
+        Call this after modifying Station objects in place.
+        """
+        self._index_stale = True
+        self._geojson = None
+        self._geojson_bytes = None
+    
+    def add_station(self, station: Station) -> None:
+        """Add or replace a station."""
+        self.stations[station.icao] = station
+        self.invalidate()
+    
+    def _ensure_index(self) -> None:
+        """Rebuild the coordinate arrays if the station set has changed."""
+        if not self._index_stale:
+            return
+        
+        self._station_list = list(self.stations.values())
+        self._lat_rad = [math.radians(s.lat) for s in self._station_list]
+        self._lon_rad = [math.radians(s.lon) for s in self._station_list]
+        self._cos_lat = [math.cos(lat) for lat in self._lat_rad]
+        self._grid = {}
+        for i, station in enumerate(self._station_list):
+            self._grid.setdefault(_grid_cell(station.lat, station.lon), []).append(i)
+        self._index_stale = False
+    
+    def _candidates_within(self, lat: float, lon: float, radius_nm: float) -> List[int]:
+        """Get indices of stations in grid cells that may lie within radius of a point."""
+        # Angular radius, padded slightly so rounding never drops a boundary cell
+        radius_rad = radius_nm / EARTH_RADIUS_NM + 1e-9
+        radius_deg = math.degrees(radius_rad)
+        lat_lo = _grid_cell(max(lat - radius_deg, -90.0), lon)[0]
+        lat_hi = _grid_cell(min(lat + radius_deg, 90.0), lon)[0]
+        
+        # Longitude half-width of the spherical cap; a cap reaching a pole spans all longitudes
+        lat_rad = math.radians(lat)
+        if abs(lat_rad) + radius_rad >= math.pi / 2:
+            lon_cells = range(_GRID_LON_CELLS)
+        else:
+            dlon_deg = math.degrees(math.asin(min(math.sin(radius_rad) / math.cos(lat_rad), 1.0)))
+            lon_lo = int(math.floor((lon - dlon_deg + 180.0) / _GRID_CELL_DEG))
+            lon_hi = int(math.floor((lon + dlon_deg + 180.0) / _GRID_CELL_DEG))
+            if lon_hi - lon_lo + 1 >= _GRID_LON_CELLS:
+                lon_cells = range(_GRID_LON_CELLS)
+            else:
+                lon_cells = [c % _GRID_LON_CELLS for c in range(lon_lo, lon_hi + 1)]
+        
+        grid = self._grid
+        candidates: List[int] = []
+        for lat_cell in range(lat_lo, lat_hi + 1):
+            for lon_cell in lon_cells:
+                cell = grid.get((lat_cell, lon_cell))
+                if cell:
+                    candidates.extend(cell)
+        # Keep database order so equal distances sort the same way as a full scan
+        candidates.sort()
+        return candidates
     
     def get_station(self, icao: str) -> Optional[Station]:
         """Get station by ICAO code."""
@@ -100,28 +206,34 @@ class StationDatabase:
         Returns:
             List of (Station, distance_nm) tuples, sorted by distance
         """
-        results: List[Tuple[Station, float]] = []
+        self._ensure_index()
         
-        for station in self.stations.values():
-            distance = station.distance_to(lat, lon)
-            if distance <= radius_nm:
-                results.append((station, distance))
+        lat_r = math.radians(lat)
+        lon_r = math.radians(lon)
+        cos_lat_r = math.cos(lat_r)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
         
-        # Sort by distance
-        results.sort(key=lambda x: x[1])
+        def distances(indices):
+            # Same haversine formula as utils.haversine_distance
+            for i in indices:
+                s_dlat = sin((lat_r - self._lat_rad[i]) / 2)
+                s_dlon = sin((lon_r - self._lon_rad[i]) / 2)
+                a = s_dlat * s_dlat + self._cos_lat[i] * cos_lat_r * s_dlon * s_dlon
+                yield self._station_list[i], EARTH_RADIUS_NM * 2 * asin(sqrt(min(a, 1.0)))
+        
+        # Only stations in nearby grid cells can be within the radius
+        candidates = self._candidates_within(lat, lon, radius_nm)
+        results = [item for item in distances(candidates) if item[1] <= radius_nm]
         
-        # Limit results
+        # Sort by distance and limit results
+        results.sort(key=lambda x: x[1])
         results = results[:max_results]
         
         # Fallback to global nearest if no results and fallback enabled
         if not results and fallback_to_global:
-            all_distances = [
-                (station, station.distance_to(lat, lon))
-                for station in self.stations.values()
-            ]
-            if all_distances:
-                all_distances.sort(key=lambda x: x[1])
-                results = all_distances[:max_results]
+            results = heapq.nsmallest(
+                max_results, distances(range(len(self._station_list))), key=lambda x: x[1]
+            )
         
         return results
     
@@ -130,7 +242,15 @@ class StationDatabase:
         return list(self.stations.values())
     
     def to_geojson(self) -> dict:
-        """Convert all stations to GeoJSON format."""
+        """
+        Convert all stations to GeoJSON format.
+        
+        The result is cached until the stations change (see invalidate()); callers
+        must not modify it.
+        """
+        if self._geojson is not None:
+            return self._geojson
+        
         features = [
             {
                 "type": "Feature",
@@ -147,7 +267,18 @@ class StationDatabase:
             for station in self.stations.values()
         ]
         
-        return {
+        self._geojson = {
             "type": "FeatureCollection",
             "features": features,
         }
+        self._geojson_bytes = None
+        return self._geojson
+    
+    def to_geojson_bytes(self) -> bytes:
+        """Serialize all stations as a GeoJSON FeatureCollection (UTF-8 JSON, cached)."""
+        geojson = self.to_geojson()
+        if self._geojson_bytes is None:
+            self._geojson_bytes = json.dumps(
+                geojson, ensure_ascii=False, separators=(",", ":"), check_circular=False
+            ).encode("utf-8")
+        return self._geojson_bytes
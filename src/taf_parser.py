@@ -3,12 +3,65 @@
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+# Issue/valid times, e.g. "121130Z", optionally as the end of a valid period,
+# e.g. "121200/131800Z" (group 1 is the period start, group 2 the time)
+_TIMES_RE = re.compile(r'\b(?:(\d{6})/)?(\d{6})Z\b')
+# Wind: e.g., "12015KT", "15020G30KT", "VRB05KT"
+_WIND_RE = re.compile(r'\b(\d{3}|VRB)(\d\d\d?)(?:G(\d\d\d?))?KT\b')
+# FM groups: e.g., "FM121800Z"
+_FM_RE = re.compile(r'\bFM(\d{6})Z\b')
+# Valid period in the current ICAO format: e.g., "3112/0118" (DDhh/DDhh)
+_PERIOD_RE = re.compile(r'(\d{4})/(\d{4})')
+
+
+def _split_wind(token: str) -> Optional[tuple]:
+    """
+    Split a plain wind token by position, e.g. "12015KT", "15020G30KT", "VRB05KT".
+    
+    Returns:
+        (direction, speed, gust) strings, gust None when absent, or None if
+        the token is not a wind group
+    """
+    dir_str = token[:3]
+    if dir_str != "VRB" and not (len(dir_str) == 3 and dir_str.isdigit()):
+        return None
+    speed_str, gust_sep, gust_str = token[3:-2].partition("G")
+    if not (2 <= len(speed_str) <= 3 and speed_str.isdigit()):
+        return None
+    if not gust_sep:
+        return dir_str, speed_str, None
+    if not (2 <= len(gust_str) <= 3 and gust_str.isdigit()):
+        return None
+    return dir_str, speed_str, gust_str
+
+
+class TAFCloud(NamedTuple):
+    """A TAF cloud layer (immutable, so it can be shared between groups and results)."""
+    
+    coverage: str  # FEW, SCT, BKN, OVC, VV
+    base_ft: Optional[int]  # Base altitude in feet
+    cloud_type: Optional[str] = None  # CB, TCU
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "coverage": self.coverage,
+            "base_ft": self.base_ft,
+            "cloud_type": self.cloud_type,
+        }
 
 
 class TAFGroup:
     """Represents a TAF group (FM, TEMPO, etc.)."""
     
+    __slots__ = (
+        "group_type", "start_time", "end_time", "wind_dir_deg", "wind_speed_kt", "wind_gust_kt",
+        "visibility_nm", "clouds", "weather_tokens",
+    )
+    
     def __init__(self, group_type: str, start_time: Optional[datetime], end_time: Optional[datetime]):
         """
         Initialize TAF group.
@@ -25,7 +78,7 @@ class TAFGroup:
         self.wind_speed_kt: Optional[float] = None
         self.wind_gust_kt: Optional[float] = None
         self.visibility_nm: Optional[float] = None
-        self.clouds: List[Dict] = []
+        self.clouds: List[TAFCloud] = []
         self.weather_tokens: List[str] = []
     
     def to_dict(self) -> dict:
@@ -38,7 +91,7 @@ class TAFGroup:
             "wind_speed_kt": self.wind_speed_kt,
             "wind_gust_kt": self.wind_gust_kt,
             "visibility_nm": self.visibility_nm,
-            "clouds": self.clouds,
+            "clouds": [c.to_dict() for c in self.clouds],
             "weather_tokens": self.weather_tokens,
         }
 
@@ -46,6 +99,8 @@ class TAFGroup:
 class ParsedTAF:
     """Parsed TAF data."""
     
+    __slots__ = ("raw", "icao", "issue_time", "valid_from", "valid_to", "prevailing", "groups", "valid")
+    
     def __init__(self, raw: str):
         self.raw = raw
         self.icao: Optional[str] = None
@@ -71,36 +126,81 @@ class ParsedTAF:
 
 
 def parse_taf_date(date_str: str, base_date: Optional[datetime] = None) -> Optional[datetime]:
-    """Parse TAF date string (e.g., '311200Z')."""
-    if not date_str or len(date_str) < 7:
+    """Parse TAF date string (e.g., '311200Z' or '311200')."""
+    if not date_str or len(date_str) < 6:
         return None
     
+    if base_date is None:
+        base_date = datetime.utcnow()
+    
     try:
-        day = int(date_str[:2])
-        hour = int(date_str[2:4])
-        minute = int(date_str[4:6])
-        
-        if base_date is None:
-            base_date = datetime.utcnow()
-        
-        # Handle month rollover
-        result = base_date.replace(day=day, hour=hour, minute=minute, second=0, microsecond=0)
-        if result > base_date + timedelta(days=15):
-            # Probably previous month
-            if base_date.month == 1:
-                result = result.replace(month=12, year=base_date.year - 1)
-            else:
-                result = result.replace(month=base_date.month - 1)
-        elif result < base_date - timedelta(days=15):
-            # Probably next month
-            if base_date.month == 12:
-                result = result.replace(month=1, year=base_date.year + 1)
-            else:
-                result = result.replace(month=base_date.month + 1)
-        
-        return result
-    except (ValueError, AttributeError):
+        result, previous_month, next_month = _taf_date_candidates(
+            date_str, base_date.year, base_date.month, base_date.tzinfo
+        )
+    except AttributeError:
+        return None
+    if result is None:
         return None
+    
+    # Handle month rollover
+    if result > base_date + timedelta(days=15):
+        # Probably previous month
+        return previous_month
+    elif result < base_date - timedelta(days=15):
+        # Probably next month
+        return next_month
+    
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _taf_date_candidates(date_str: str, year: int, month: int, tzinfo) -> tuple:
+    """
+    Resolve a TAF date string in the base month and its neighbours.
+    
+    Memoized since the same DDhhmm strings recur across TAFs from one issue cycle.
+    
+    Returns:
+        (this_month, previous_month, next_month) datetimes, None where the
+        day does not exist in that month or the string is not a date
+    """
+    digits = date_str[:6]
+    try:
+        if digits.isascii() and digits.isdigit():
+            # Plain DDhhmm digits: decode directly from the character codes
+            b = digits.encode("ascii")
+            day = (b[0] - 48) * 10 + b[1] - 48
+            hour = (b[2] - 48) * 10 + b[3] - 48
+            minute = (b[4] - 48) * 10 + b[5] - 48
+        else:
+            day = int(date_str[:2])
+            hour = int(date_str[2:4])
+            minute = int(date_str[4:6])
+        result = datetime(year, month, day, hour, minute, tzinfo=tzinfo)
+    except ValueError:
+        return None, None, None
+    
+    previous_year, previous = (year - 1, 12) if month == 1 else (year, month - 1)
+    try:
+        previous_month = datetime(previous_year, previous, day, hour, minute, tzinfo=tzinfo)
+    except ValueError:
+        previous_month = None
+    
+    next_year, following = (year + 1, 1) if month == 12 else (year, month + 1)
+    try:
+        next_month = datetime(next_year, following, day, hour, minute, tzinfo=tzinfo)
+    except ValueError:
+        next_month = None
+    
+    return result, previous_month, next_month
+
+
+def _parse_period_date(ddhh: str, base_date: datetime) -> Optional[datetime]:
+    """Parse a DDhh valid period time (e.g., '0118'); hour 24 is the end of that day."""
+    if ddhh[2:] == "24":
+        start_of_day = parse_taf_date(ddhh[:2] + "0000", base_date)
+        return start_of_day + timedelta(days=1) if start_of_day else None
+    return parse_taf_date(ddhh + "00", base_date)
 
 
 def parse_taf(raw: str) -> ParsedTAF:
@@ -122,35 +222,72 @@ def parse_taf(raw: str) -> ParsedTAF:
         elif len(parts[0]) == 4:
             taf.icao = parts[0].upper()
     
-    # Parse issue time and valid period
-    # Format: TAF ICAO DDhhmmZ DDhhmm/DDhhmmZ
-    date_pattern = r'\b(\d{6})Z\b'
-    date_matches = list(re.finditer(date_pattern, raw))
+    # One reference time for every date in this TAF
+    base_date = datetime.utcnow()
     
-    if len(date_matches) >= 1:
-        taf.issue_time = parse_taf_date(date_matches[0].group(1))
+    # Single pass over the whitespace-separated tokens. Plain alphanumeric tokens
+    # are classified by shape; anything else (e.g. periods with "/") goes through
+    # the regexes, which never match across whitespace. Positions are
+    # (token index, offset) so groups can be matched up in text order.
+    date_strs = []
+    period = None
+    short_period = None
+    winds = []
+    fms = []
+    for index, token in enumerate(parts):
+        if token.isascii() and token.isalnum():
+            length = len(token)
+            if token[-1] == "Z":
+                if length == 7 and token[:6].isdigit():
+                    date_strs.append(token[:6])
+                elif length == 9 and token[:2] == "FM" and token[2:8].isdigit():
+                    fms.append(((index, 0), (index, length), token[2:8]))
+            elif token[-2:] == "KT":
+                wind = _split_wind(token)
+                if wind:
+                    winds.append(((index, 0),) + wind)
+            continue
+        
+        # Substring checks skip regexes whose required literal is absent
+        if "Z" in token:
+            for times_match in _TIMES_RE.finditer(token):
+                date_strs.append(times_match.group(2))
+                if period is None and times_match.group(1) is not None:
+                    period = times_match.group(1, 2)
+        if "KT" in token:
+            for wind_match in _WIND_RE.finditer(token):
+                winds.append(((index, wind_match.start()),) + wind_match.group(1, 2, 3))
+        if "FM" in token:
+            for fm_match in _FM_RE.finditer(token):
+                fms.append(((index, fm_match.start()), (index, fm_match.end()), fm_match.group(1)))
+        if short_period is None and "/" in token:
+            period_match = _PERIOD_RE.fullmatch(token)
+            if period_match:
+                short_period = period_match.group(1, 2)
+    
+    # Parse issue time and valid period
+    # Format: TAF ICAO DDhhmmZ DDhhmm/DDhhmmZ, or TAF ICAO DDhhmmZ DDhh/DDhh
+    if len(date_strs) >= 1:
+        taf.issue_time = parse_taf_date(date_strs[0], base_date)
     
-    if len(date_matches) >= 2:
-        taf.valid_from = parse_taf_date(date_matches[1].group(1))
+    if len(date_strs) >= 2:
+        taf.valid_from = parse_taf_date(date_strs[1], base_date)
     
-    if len(date_matches) >= 3:
-        taf.valid_to = parse_taf_date(date_matches[2].group(1))
-    elif len(date_matches) >= 2:
+    if len(date_strs) >= 3:
+        taf.valid_to = parse_taf_date(date_strs[2], base_date)
+    elif len(date_strs) >= 2:
         # Valid period might be in format DDhhmm/DDhhmmZ
-        period_pattern = r'\b(\d{6})/(\d{6})Z\b'
-        period_match = re.search(period_pattern, raw)
-        if period_match:
-            taf.valid_from = parse_taf_date(period_match.group(1))
-            taf.valid_to = parse_taf_date(period_match.group(2))
+        if period:
+            taf.valid_from = parse_taf_date(period[0], base_date)
+            taf.valid_to = parse_taf_date(period[1], base_date)
+    elif short_period:
+        taf.valid_from = _parse_period_date(short_period[0], base_date)
+        taf.valid_to = _parse_period_date(short_period[1], base_date)
     
     # Parse prevailing conditions (before first FM)
     # Extract wind, visibility, clouds from main body
-    wind_pattern = r'\b(\d{3}|VRB)(\d{2,3})(G(\d{2,3}))?KT\b'
-    wind_match = re.search(wind_pattern, raw)
-    if wind_match:
-        dir_str = wind_match.group(1)
-        speed_str = wind_match.group(2)
-        gust_str = wind_match.group(4)
+    if winds:
+        _, dir_str, speed_str, gust_str = winds[0]
         
         if dir_str != "VRB":
             taf.prevailing.wind_dir_deg = int(dir_str)
@@ -159,35 +296,26 @@ def parse_taf(raw: str) -> ParsedTAF:
             taf.prevailing.wind_gust_kt = float(gust_str)
     
     # Parse FM groups (forecast changes)
-    fm_pattern = r'\bFM(\d{6})Z\b'
-    fm_matches = list(re.finditer(fm_pattern, raw))
+    wind_index = 0
     
-    for i, fm_match in enumerate(fm_matches):
-        start_time = parse_taf_date(fm_match.group(1))
+    for i, (_, start_pos, date_str) in enumerate(fms):
+        start_time = parse_taf_date(date_str, base_date)
         
         # Find end time (next FM or end of TAF)
-        if i + 1 < len(fm_matches):
-            end_time = parse_taf_date(fm_matches[i + 1].group(1))
+        if i + 1 < len(fms):
+            end_time = parse_taf_date(fms[i + 1][2], base_date)
+            end_pos = fms[i + 1][0]
         else:
             end_time = taf.valid_to
+            end_pos = None
         
         group = TAFGroup("FM", start_time, end_time)
         
-        # Extract wind from this group
-        # Find text between this FM and next
-        start_pos = fm_match.end()
-        if i + 1 < len(fm_matches):
-            end_pos = fm_matches[i + 1].start()
-        else:
-            end_pos = len(raw)
-        
-        group_text = raw[start_pos:end_pos]
-        
-        group_wind_match = re.search(wind_pattern, group_text)
-        if group_wind_match:
-            dir_str = group_wind_match.group(1)
-            speed_str = group_wind_match.group(2)
-            gust_str = group_wind_match.group(4)
+        # Extract wind from this group: the first wind between this FM and the next
+        while wind_index < len(winds) and winds[wind_index][0] < start_pos:
+            wind_index += 1
+        if wind_index < len(winds) and (end_pos is None or winds[wind_index][0] < end_pos):
+            _, dir_str, speed_str, gust_str = winds[wind_index]
             
             if dir_str != "VRB":
                 group.wind_dir_deg = int(dir_str)
@@ -1,9 +1,17 @@
 """Utility functions."""
 
+import math
 import sys
 from typing import Tuple
 
 
+# sys.maxsize cannot change while running, so the bitness check is done once
+if sys.maxsize > 2**32:
+    _PYTHON_BITNESS = (False, f"Python is 64-bit (maxsize={sys.maxsize}). FSUIPC requires 32-bit Python.")
+else:
+    _PYTHON_BITNESS = (True, f"Python is 32-bit (maxsize={sys.maxsize}).")
+
+
 def check_python_bitness() -> Tuple[bool, str]:
     """
     Check if Python is 32-bit.
@@ -11,10 +19,7 @@ def check_python_bitness() -> Tuple[bool, str]:
     Returns:
         Tuple of (is_32bit, message)
     """
-    if sys.maxsize > 2**32:
-        return False, f"Python is 64-bit (maxsize={sys.maxsize}). FSUIPC requires 32-bit Python."
-    else:
-        return True, f"Python is 32-bit (maxsize={sys.maxsize})."
+    return _PYTHON_BITNESS
 
 
 def require_32bit_python() -> None:
@@ -42,6 +47,10 @@ def km_to_nm(km: float) -> float:
     return km / 1.852
 
 
+EARTH_RADIUS_NM = 6371.0 / 1.852  # Mean Earth radius (6371 km) in nautical miles
+_DEG_TO_RAD = math.pi / 180.0  # Same factor math.radians() uses
+
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate great circle distance between two points in nautical miles.
@@ -53,20 +62,16 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in nautical miles
     """
-    import math
-    
-    R_km = 6371.0  # Earth radius in km
-    R_nm = R_km / 1.852  # Earth radius in nm
-    
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
+    sin, cos = math.sin, math.cos
+    lat1_rad = lat1 * _DEG_TO_RAD
+    lat2_rad = lat2 * _DEG_TO_RAD
+    dlat = (lat2 - lat1) * _DEG_TO_RAD
+    dlon = (lon2 - lon1) * _DEG_TO_RAD
     
     a = (
-        math.sin(dlat / 2) ** 2 +
-        math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+        sin(dlat / 2) ** 2 +
+        cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
     )
     c = 2 * math.asin(math.sqrt(a))
     
-    return R_nm * c
+    return EARTH_RADIUS_NM * c
@@ -11,6 +11,11 @@ from src.taf_parser import ParsedTAF
 class CombinedWeather:
     """Combined weather data from METAR and TAF."""
     
+    __slots__ = (
+        "wind_dir_deg", "wind_speed_kt", "wind_gust_kt", "visibility_nm", "temperature_c", "dewpoint_c",
+        "qnh_hpa", "clouds", "weather_tokens", "source", "metar_used", "taf_used",
+    )
+    
     def __init__(self):
         self.wind_dir_deg: Optional[float] = None
         self.wind_speed_kt: Optional[float] = None
@@ -19,12 +24,19 @@ class CombinedWeather:
         self.temperature_c: Optional[float] = None
         self.dewpoint_c: Optional[float] = None
         self.qnh_hpa: Optional[float] = None
-        self.clouds: list = []
-        self.weather_tokens: list[str] = []
+        # Tuples, because the parsed METAR/TAF objects they are copied from are
+        # cached and shared; clouds may hold CloudLayer or TAFCloud objects,
+        # which to_dict() converts
+        self.clouds: tuple = ()
+        self.weather_tokens: tuple[str, ...] = ()
         self.source: str = "unknown"
         self.metar_used: bool = False
         self.taf_used: bool = False
     
+    def cloud_dicts(self) -> list:
+        """Get cloud layers as new dictionaries."""
+        return [c.to_dict() if hasattr(c, "to_dict") else dict(c) for c in self.clouds]
+    
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
@@ -35,8 +47,8 @@ class CombinedWeather:
             "temperature_c": self.temperature_c,
             "dewpoint_c": self.dewpoint_c,
             "qnh_hpa": self.qnh_hpa,
-            "clouds": self.clouds,
-            "weather_tokens": self.weather_tokens,
+            "clouds": self.cloud_dicts(),
+            "weather_tokens": list(self.weather_tokens),
             "source": self.source,
             "metar_used": self.metar_used,
             "taf_used": self.taf_used,
@@ -63,60 +75,85 @@ def combine_weather(
     """
     combined = CombinedWeather()
     
-    if config.mode == "metar_only":
-        # Use METAR only, ignore TAF
-        if metar and metar.valid:
-            _apply_metar(combined, metar)
-            combined.source = "metar_only"
-            combined.metar_used = True
-        else:
-            # No valid METAR
-            combined.source = "none"
+    handler = _MODE_HANDLERS.get(config.mode)
+    if handler is not None:
+        handler(combined, metar, taf, config, metar_age_seconds)
+    
+    return combined
+
+
+def _combine_metar_only(
+    combined: CombinedWeather,
+    metar: Optional[ParsedMETAR],
+    taf: Optional[ParsedTAF],
+    config: WeatherCombiningConfig,
+    metar_age_seconds: Optional[float],
+) -> None:
+    """Use METAR only, ignore TAF."""
+    if metar and metar.valid:
+        _apply_metar(combined, metar)
+        combined.source = "metar_only"
+        combined.metar_used = True
+    else:
+        # No valid METAR
+        combined.source = "none"
+
+
+def _combine_metar_taf_fallback(
+    combined: CombinedWeather,
+    metar: Optional[ParsedMETAR],
+    taf: Optional[ParsedTAF],
+    config: WeatherCombiningConfig,
+    metar_age_seconds: Optional[float],
+) -> None:
+    """Use METAR if available and fresh, otherwise TAF."""
+    metar_stale = (
+        metar_age_seconds is not None and
+        metar_age_seconds > config.taf_fallback_stale_seconds
+    )
     
-    elif config.mode == "metar_taf_fallback":
-        # Use METAR if available and fresh, otherwise TAF
-        metar_stale = (
-            metar_age_seconds is not None and
-            metar_age_seconds > config.taf_fallback_stale_seconds
-        )
+    if metar and metar.valid and not metar_stale:
+        _apply_metar(combined, metar)
+        combined.source = "metar"
+        combined.metar_used = True
+    elif taf and taf.valid:
+        # Use TAF prevailing conditions
+        _apply_taf_prevailing(combined, taf)
+        combined.source = "taf_fallback"
+        combined.taf_used = True
+    elif metar and metar.valid:
+        # Use stale METAR as last resort
+        _apply_metar(combined, metar)
+        combined.source = "metar_stale"
+        combined.metar_used = True
+    else:
+        combined.source = "none"
+
+
+def _combine_metar_taf_assist(
+    combined: CombinedWeather,
+    metar: Optional[ParsedMETAR],
+    taf: Optional[ParsedTAF],
+    config: WeatherCombiningConfig,
+    metar_age_seconds: Optional[float],
+) -> None:
+    """METAR defines current weather, TAF guides smoothing."""
+    if metar and metar.valid:
+        _apply_metar(combined, metar)
+        combined.source = "metar"
+        combined.metar_used = True
         
-        if metar and metar.valid and not metar_stale:
-            _apply_metar(combined, metar)
-            combined.source = "metar"
-            combined.metar_used = True
-        elif taf and taf.valid:
-            # Use TAF prevailing conditions
+        # TAF is available for smoothing guidance but doesn't override
+        if taf and taf.valid:
+            combined.taf_used = True
+    else:
+        # No METAR, fallback to TAF
+        if taf and taf.valid:
             _apply_taf_prevailing(combined, taf)
             combined.source = "taf_fallback"
             combined.taf_used = True
-        elif metar and metar.valid:
-            # Use stale METAR as last resort
-            _apply_metar(combined, metar)
-            combined.source = "metar_stale"
-            combined.metar_used = True
         else:
             combined.source = "none"
-    
-    elif config.mode == "metar_taf_assist":
-        # METAR defines current, TAF guides smoothing
-        if metar and metar.valid:
-            _apply_metar(combined, metar)
-            combined.source = "metar"
-            combined.metar_used = True
-            
-            # TAF is available for smoothing guidance but doesn't override
-            if taf and taf.valid:
-                combined.taf_used = True
-        else:
-            # No METAR, fallback to TAF
-            if taf and taf.valid:
-                _apply_taf_prevailing(combined, taf)
-                combined.source = "taf_fallback"
-                combined.taf_used = True
-            else:
-                combined.source = "none"
-    
-    return combined
 
 
 def _apply_metar(combined: CombinedWeather, metar: ParsedMETAR) -> None:
@@ -128,8 +165,8 @@ def _apply_metar(combined: CombinedWeather, metar: ParsedMETAR) -> None:
     combined.temperature_c = metar.temperature_c
     combined.dewpoint_c = metar.dewpoint_c
     combined.qnh_hpa = metar.qnh_hpa
-    combined.clouds = [c.to_dict() for c in metar.clouds]
-    combined.weather_tokens = metar.weather_tokens.copy()
+    combined.clouds = tuple(metar.clouds)
+    combined.weather_tokens = tuple(metar.weather_tokens)
 
 
 def _apply_taf_prevailing(combined: CombinedWeather, taf: ParsedTAF) -> None:
@@ -139,5 +176,13 @@ def _apply_taf_prevailing(combined: CombinedWeather, taf: ParsedTAF) -> None:
     combined.wind_speed_kt = taf.prevailing.wind_speed_kt
     combined.wind_gust_kt = taf.prevailing.wind_gust_kt
     combined.visibility_nm = taf.prevailing.visibility_nm
-    combined.clouds = taf.prevailing.clouds.copy()
-    combined.weather_tokens = taf.prevailing.weather_tokens.copy()
+    combined.clouds = tuple(taf.prevailing.clouds)
+    combined.weather_tokens = tuple(taf.prevailing.weather_tokens)
+
+
+# Combining mode -> handler; unknown modes leave the combined weather empty
+_MODE_HANDLERS = {
+    "metar_only": _combine_metar_only,
+    "metar_taf_fallback": _combine_metar_taf_fallback,
+    "metar_taf_assist": _combine_metar_taf_assist,
+}
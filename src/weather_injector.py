@@ -1,14 +1,19 @@
 """Weather injection interface."""
 
 import ctypes
+import heapq
 import logging
 import os
 import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from ctypes import byref, c_char_p, c_double, c_float, c_int, c_uint, c_ulong, c_void_p, POINTER
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from src.weather_smoother import WeatherState
 
@@ -29,6 +34,8 @@ except (ImportError, OSError, ModuleNotFoundError):
 # SimConnect constants
 SIMCONNECT_OBJECT_ID_USER = 0
 SIMCONNECT_OPEN_CONFIGINDEX_LOCAL = 0
+# WeatherSetObservation "Seconds" argument, prebuilt so ctypes skips int conversion per call
+_C_SECONDS_IMMEDIATE = c_uint(0)
 
 # SimConnect weather observation structure
 class SIMCONNECT_DATA_WEATHER_OBSERVATION(ctypes.Structure):
@@ -36,9 +43,9 @@ class SIMCONNECT_DATA_WEATHER_OBSERVATION(ctypes.Structure):
         ("Metar", c_char_p),  # METAR string
     ]
 
-# Try to load SimConnect.dll
-SIMCONNECT_AVAILABLE = False
+# SimConnect.dll is loaded on first use by _get_simconnect_dll()
 SimConnectDLL = None
+_simconnect_probed = False
 
 # Common SimConnect.dll locations
 simconnect_paths = [
@@ -56,31 +63,107 @@ simconnect_paths = [
     r"C:\Windows\SysWOW64\SimConnect.dll",
 ]
 
-# First, try to find it in common locations
-for path in simconnect_paths:
-    if os.path.exists(path):
-        try:
-            SimConnectDLL = ctypes.WinDLL(path)
-            SIMCONNECT_AVAILABLE = True
-            logger.info(f"Found SimConnect.dll at: {path}")
-            break
-        except Exception as e:
-            logger.debug(f"Failed to load SimConnect.dll from {path}: {e}")
-            continue
 
-# If not found, try loading by name (Windows will search PATH and registered DLLs)
-if not SIMCONNECT_AVAILABLE:
-    try:
-        SimConnectDLL = ctypes.WinDLL("SimConnect.dll")
-        SIMCONNECT_AVAILABLE = True
-        logger.info("Loaded SimConnect.dll from system PATH or registered location")
-    except Exception as e:
-        logger.debug(f"Failed to load SimConnect.dll by name: {e}")
+def _setup_simconnect_signatures(dll) -> None:
+    """Set the ctypes argument and return types of the SimConnect functions we call.
+    
+    Runs once, when the DLL is loaded, so every user of the module-level handle
+    shares the same configured function pointers.
+    """
+    # SimConnect_Open
+    dll.SimConnect_Open.argtypes = [POINTER(c_void_p), c_char_p, c_void_p, c_uint, c_void_p, c_uint]
+    dll.SimConnect_Open.restype = c_int
+    
+    # SimConnect_Close
+    dll.SimConnect_Close.argtypes = [c_void_p]
+    dll.SimConnect_Close.restype = c_int
+    
+    # SimConnect_WeatherSetObservation
+    # Signature: SimConnect_WeatherSetObservation(HANDLE hSimConnect, DWORD Seconds, const char* szMETAR)
+    # Parameters: hSimConnect, Seconds (time until observation), METAR string
+    dll.SimConnect_WeatherSetObservation.argtypes = [
+        c_void_p,
+        c_uint,  # Seconds until observation takes effect
+        c_char_p  # METAR string (must start with "GLOB" for global weather)
+    ]
+    dll.SimConnect_WeatherSetObservation.restype = c_int
+    
+    # SimConnect_WeatherSetModeServer
+    dll.SimConnect_WeatherSetModeServer.argtypes = [
+        c_void_p,
+        c_uint,
+        c_uint
+    ]
+    dll.SimConnect_WeatherSetModeServer.restype = c_int
+    
+    # SimConnect_WeatherSetModeCustom
+    dll.SimConnect_WeatherSetModeCustom.argtypes = [
+        c_void_p
+    ]
+    dll.SimConnect_WeatherSetModeCustom.restype = c_int
+    
+    # SimConnect_WeatherSetModeGlobal
+    dll.SimConnect_WeatherSetModeGlobal.argtypes = [
+        c_void_p
+    ]
+    dll.SimConnect_WeatherSetModeGlobal.restype = c_int
+    
+    # SimConnect_WeatherSetModeTheme
+    dll.SimConnect_WeatherSetModeTheme.argtypes = [
+        c_void_p,
+        c_char_p
+    ]
+    dll.SimConnect_WeatherSetModeTheme.restype = c_int
+    
+    # SimConnect_CallDispatch
+    dll.SimConnect_CallDispatch.argtypes = [c_void_p, c_void_p, c_void_p]
+    dll.SimConnect_CallDispatch.restype = c_int
+    
+    logger.info("SimConnect function signatures configured")
+
 
-if not SIMCONNECT_AVAILABLE:
+def _get_simconnect_dll():
+    """Load SimConnect.dll on first call and return it, or None if unavailable.
+    
+    The search runs once per process; later calls return the cached result.
+    """
+    global SimConnectDLL, _simconnect_probed
+    if _simconnect_probed:
+        return SimConnectDLL
+    _simconnect_probed = True
+    
+    # First, try to find it in common locations
+    dll = None
+    for path in simconnect_paths:
+        if os.path.exists(path):
+            try:
+                dll = ctypes.WinDLL(path)
+                logger.info(f"Found SimConnect.dll at: {path}")
+                break
+            except Exception as e:
+                logger.debug(f"Failed to load SimConnect.dll from {path}: {e}")
+    
+    # If not found, try loading by name (Windows will search PATH and registered DLLs)
+    if dll is None:
+        try:
+            dll = ctypes.WinDLL("SimConnect.dll")
+            logger.info("Loaded SimConnect.dll from system PATH or registered location")
+        except Exception as e:
+            logger.debug(f"Failed to load SimConnect.dll by name: {e}")
+    
+    if dll is not None:
+        try:
+            _setup_simconnect_signatures(dll)
+        except Exception as e:
+            logger.error(f"Failed to setup SimConnect functions: {e}")
+            return None
+        SimConnectDLL = dll
+        return SimConnectDLL
+    
     logger.warning("SimConnect.dll not found. Weather injection via SimConnect will not be available.")
     logger.warning("SimConnect.dll is typically installed with FSX SDK or can be downloaded from Microsoft.")
     logger.warning("If FSX is installed, SimConnect.dll should be in the FSX installation directory or Windows system folders.")
+    return None
 
 
 class WeatherInjector(ABC):
@@ -120,6 +203,225 @@ class DEVInjector(WeatherInjector):
         return self.last_injected
 
 
+_METAR_CACHE_TTL_SECONDS = 600.0
+_STATION_CACHE_TTL_SECONDS = 30.0
+# Unchanged weather is re-sent after this long in case FSX dropped it
+_REINJECT_INTERVAL_SECONDS = 30.0
+# Same for unchanged FSUIPC station METARs, which are refreshed about once a minute
+_FSUIPC_REWRITE_INTERVAL_SECONDS = 300.0
+# Background SimConnect dispatch: idle poll interval and calls per requested burst
+_DISPATCH_IDLE_SECONDS = 0.05
+_DISPATCH_BURST = 50
+
+
+def _metar_content_key(parsed_metar) -> tuple:
+    """Return a hashable key of the parsed METAR fields used to build the injected METAR."""
+    clouds = getattr(parsed_metar, 'clouds', None) or ()
+    return (
+        parsed_metar.wind_dir_deg,
+        parsed_metar.wind_speed_kt,
+        parsed_metar.wind_gust_kt,
+        parsed_metar.visibility_nm,
+        parsed_metar.temperature_c,
+        parsed_metar.dewpoint_c,
+        parsed_metar.qnh_hpa,
+        tuple(getattr(parsed_metar, 'weather_tokens', None) or ()),
+        tuple((getattr(c, 'coverage', None), getattr(c, 'base_ft', None)) for c in clouds),
+    )
+
+
+def _weather_state_key(weather: WeatherState) -> tuple:
+    """Return a hashable key of the weather state fields used to build the injected METAR."""
+    return (
+        weather.wind_dir_deg,
+        weather.wind_speed_kt,
+        weather.wind_gust_kt,
+        weather.visibility_nm,
+        weather.temperature_c,
+        weather.dewpoint_c,
+        weather.qnh_hpa,
+        tuple(weather.weather_tokens),
+        tuple(weather.clouds),
+    )
+
+
+# ICAO-style visibility steps: _VIS_CODES[i] applies from _VIS_THRESHOLDS[i - 1] meters up
+_VIS_THRESHOLDS = (800, 1600, 3000, 5000, 8000, 10000)
+_VIS_CODES = (b"0400", b"0800", b"1600", b"3000", b"5000", b"8000", b"9999")
+
+# METAR cloud coverage codes (anything else, e.g. VV, is injected as SCT)
+_COVERAGE_CODES = {'FEW': b'FEW', 'SCT': b'SCT', 'BKN': b'BKN', 'OVC': b'OVC', 'CLR': b'SKC', 'SKC': b'SKC'}
+
+
+# (minute since epoch, DDHHMMZ bytes) for the current UTC minute
+_metar_time_cache: Tuple[int, bytes] = (-1, b"")
+
+
+def _metar_time_bytes() -> bytes:
+    """Return the current UTC time as METAR DDHHMMZ bytes, formatted once per minute."""
+    global _metar_time_cache
+    minute = int(time.time()) // 60
+    cached = _metar_time_cache
+    if cached[0] != minute:
+        utc = time.gmtime(minute * 60)
+        cached = (minute, b"%02d%02d%02dZ" % (utc.tm_mday, utc.tm_hour, utc.tm_min))
+        _metar_time_cache = cached
+    return cached[1]
+
+
+def _wind_bytes(wind_dir_deg: Optional[float], wind_speed_kt: Optional[float], wind_gust_kt: Optional[float]) -> bytes:
+    """Format the METAR wind group, using 090 instead of 000 for winds of 10kt or more."""
+    if wind_dir_deg is None or wind_speed_kt is None:
+        return b"00000KT"
+    wind_dir = int(wind_dir_deg) % 360
+    wind_speed = int(wind_speed_kt)
+    if wind_speed >= 10 and wind_dir == 0:
+        wind_dir = 90
+    if wind_speed == 0:
+        return b"00000KT"
+    if wind_gust_kt is not None and wind_gust_kt > wind_speed_kt:
+        return b"%03d%02dG%02dKT" % (wind_dir, wind_speed, int(wind_gust_kt))
+    return b"%03d%02dKT" % (wind_dir, wind_speed)
+
+
+def _visibility_bytes(vis_m: float) -> bytes:
+    """Format a visibility in meters as an ICAO step (9999 for 10km or more, 0400 minimum)."""
+    return _VIS_CODES[bisect_right(_VIS_THRESHOLDS, vis_m)]
+
+
+@lru_cache(maxsize=256)
+def _station_header(station_icao: str) -> bytes:
+    """Return the encoded "<ICAO> METAR" prefix for a station, built once per station."""
+    return station_icao.upper().encode('utf-8') + b" METAR"
+
+
+@lru_cache(maxsize=256)
+def _weather_code(token: str) -> Optional[bytes]:
+    """Return the RA/SN/FG code FSX understands for a METAR weather token, or None.
+    
+    RA takes precedence over SN, and SN over FG (e.g. SNRA -> RA).
+    """
+    token = token.upper()
+    if "RA" in token:
+        return b"RA"
+    if "SN" in token:
+        return b"SN"
+    if "FG" in token:
+        return b"FG"
+    return None
+
+
+def _weather_codes(weather_tokens) -> List[bytes]:
+    """Map METAR weather tokens to the RA/SN/FG codes FSX understands, dropping the rest."""
+    codes = []
+    for token in weather_tokens:
+        code = _weather_code(token)
+        if code is not None:
+            codes.append(code)
+    return codes
+
+
+# Precompiled templates for the fixed-shape METAR groups
+_METAR_HEAD_TEMPLATE = b"%s %s %s %s"
+_CLOUD_TEMPLATE = b"%s%03d"
+_TEMP_QNH_TEMPLATE = b"%02d/%02d Q%d"
+_QNH_TEMPLATE = b"Q%d"
+
+
+def _build_metar_from_fields(
+    header: bytes,
+    wind_dir_deg: Optional[float],
+    wind_speed_kt: Optional[float],
+    wind_gust_kt: Optional[float],
+    visibility_nm: Optional[float],
+    wx_groups: List[bytes],
+    clouds: Optional[Sequence[Tuple[str, float]]],
+    temperature_c: Optional[float],
+    dewpoint_c: Optional[float],
+    qnh_hpa: Optional[float],
+    station_label: str = "",
+) -> bytes:
+    """Build an encoded METAR from individual weather fields.
+    
+    Format: "<header> DDHHMMZ dddssKT vis [wx] clouds [temp/dew] Q####"
+    
+    Args:
+        header: Station prefix, e.g. b"SBGR METAR" or b"GLOB"
+        wind_dir_deg: Wind direction in degrees
+        wind_speed_kt: Wind speed in knots
+        wind_gust_kt: Gust speed in knots
+        visibility_nm: Visibility in nautical miles
+        wx_groups: Encoded weather groups (see _weather_codes)
+        clouds: Up to three (coverage, base_ft) layers; None if there are no clouds (SKC)
+        temperature_c: Temperature in Celsius
+        dewpoint_c: Dewpoint in Celsius (temperature - 5 if missing)
+        qnh_hpa: Pressure in hPa
+        station_label: Extra context for the out-of-range QNH warning
+    
+    Returns:
+        ASCII METAR bytes (without null terminator)
+    """
+    # Fixed-shape head: header, date/time (DDHHMMZ, current UTC), wind, visibility.
+    # Wind avoids 000ddKT when speed>=10 (calm direction at high speed edge case);
+    # visibility uses ICAO-style meter steps (1 nm = 1852 meters).
+    parts = [_METAR_HEAD_TEMPLATE % (
+        header,
+        _metar_time_bytes(),
+        _wind_bytes(wind_dir_deg, wind_speed_kt, wind_gust_kt),
+        _visibility_bytes(visibility_nm * 1852) if visibility_nm is not None else b"9999",
+    )]
+    
+    # Weather phenomena
+    parts += wx_groups
+    
+    # Clouds (OVC000/BKN000 often invalid in FSX; use minimum 005 = 500 ft)
+    if clouds is None:
+        parts.append(b"SKC")
+    else:
+        for coverage, base_ft in clouds:
+            parts.append(_CLOUD_TEMPLATE % (_COVERAGE_CODES.get(coverage, b'SCT'), max(5, int(base_ft) // 100)))
+    
+    # QNH (pressure)
+    if qnh_hpa is not None:
+        qnh = qnh_hpa
+        if not (870 <= qnh <= 1080):
+            logger.warning(f"QNH value {qnh} hPa is out of normal range{station_label}, using default 1013 hPa")
+            qnh = 1013.25
+        qnh = round(qnh)  # round() of a float already returns an int
+    else:
+        qnh = 1013
+    
+    # Temperature/dewpoint and QNH share one template; the temperature group is optional
+    if temperature_c is not None:
+        temp = int(temperature_c)
+        dewp = int(dewpoint_c) if dewpoint_c is not None else temp - 5
+        parts.append(_TEMP_QNH_TEMPLATE % (temp, dewp, qnh))
+    else:
+        parts.append(_QNH_TEMPLATE % qnh)
+    
+    return b" ".join(parts)
+
+
+def _build_weather_state_metar(header: bytes, weather: WeatherState) -> bytes:
+    """Build an encoded METAR from a (smoothed) weather state."""
+    wx_codes = _weather_codes(weather.weather_tokens) if weather.weather_tokens else None
+    # Weather state codes go out as a single group of at most two codes (e.g. RASN)
+    wx_groups = [b"".join(wx_codes[:2])] if wx_codes else []
+    return _build_metar_from_fields(
+        header,
+        weather.wind_dir_deg,
+        weather.wind_speed_kt,
+        weather.wind_gust_kt,
+        weather.visibility_nm,
+        wx_groups,
+        # WeatherCloud layers already unpack as (coverage, base_ft)
+        weather.clouds[:3] if weather.clouds else None,
+        weather.temperature_c,
+        weather.dewpoint_c,
+        weather.qnh_hpa,
+    )
+
+
 class FSUIPCWeatherInjector(WeatherInjector):
     """FSUIPC-based weather injector for FSX.
     
@@ -151,6 +453,20 @@ class FSUIPCWeatherInjector(WeatherInjector):
         self.fsuipc_bridge = fsuipc_bridge
         self.station_selection_config = station_selection_config
         self.station_db = station_db  # Use pre-loaded station database
+        # Pre-encoded METAR bytes per station: icao -> (content key, last used, bytes)
+        self._metar_cache: Dict[str, Tuple[tuple, float, bytes]] = {}
+        # Last nearest-station lookup: (position cell, time, icao)
+        self._station_cache: Optional[Tuple[tuple, float, str]] = None
+        # Last write per station: icao -> (content key, time written), valid for _last_written_connection
+        self._last_written: Dict[str, Tuple[tuple, float]] = {}
+        self._last_written_connection = None
+        # Prepared 0xB000 write specifications by batch size, for _prepared_connection
+        self._prepared_writes: Dict[int, object] = {}
+        self._prepared_connection = None
+        # Last consistency check: (per-station inputs, indices of accepted stations)
+        self._last_validation: Optional[Tuple[list, List[int]]] = None
+        # SimConnect handle kept open for Custom mode requests
+        self._hSimConnect: Optional[c_void_p] = None
         logger.info("FSUIPCWeatherInjector initialized (using FSUIPC offset 0xB000 for station-based METAR injection)")
     
     def inject_station_metars(self, stations_with_metars: List[Tuple[str, object, float]], max_stations: int = 5) -> bool:
@@ -183,159 +499,169 @@ class FSUIPCWeatherInjector(WeatherInjector):
             self._ensure_simconnect_custom_mode()
             
             # Sort by distance and take closest stations
-            sorted_stations = sorted(stations_with_metars, key=lambda x: x[2])[:max_stations]
+            sorted_stations = heapq.nsmallest(max_stations, stations_with_metars, key=itemgetter(2))
             
             # Validate stations for consistency - filter out stations with inconsistent weather
             validated_stations = self._validate_station_consistency(sorted_stations)
             
-            success_count = 0
+            now = time.monotonic()
+            self._evict_stale_metars(now)
+            
+            metars = []
+            written = []
+            unchanged = 0
             for station_icao, parsed_metar, distance_nm in validated_stations:
                 if not parsed_metar or not getattr(parsed_metar, 'valid', False):
-                    logger.debug(f"Skipping {station_icao}: invalid or missing METAR")
+                    logger.debug("Skipping %s: invalid or missing METAR", station_icao)
                     continue
                 
-                # Build METAR string from parsed METAR (use raw data, not blended)
-                metar_string = self._build_metar_from_parsed(parsed_metar, station_icao)
-                
-                if not metar_string:
-                    logger.warning(f"Failed to build METAR string for {station_icao}")
+                key = _metar_content_key(parsed_metar)
+                if self._is_duplicate_write(station_icao, key, now):
+                    logger.debug("Skipping %s: METAR unchanged since last write", station_icao)
+                    unchanged += 1
                     continue
                 
-                # Convert to bytes with null terminator
-                metar_bytes = metar_string.encode('utf-8') + b'\x00'
-                
-                logger.info(f"Injecting METAR for {station_icao} (distance: {distance_nm:.1f}nm): {metar_string}")
+                # Reuse the encoded METAR when the station's weather is unchanged
+                metar_bytes = self._get_cached_metar_bytes(station_icao, parsed_metar, key, now)
                 
-                # Write to FSUIPC offset 0xB000
-                try:
-                    self.fsuipc_bridge.connection.write([(0xB000, -256, metar_bytes)])
-                    success_count += 1
-                    # Small delay between stations to let FSUIPC/SimConnect process
-                    time.sleep(0.1)
-                except Exception as e:
-                    logger.warning(f"Failed to write METAR for {station_icao}: {e}")
+                if not metar_bytes:
+                    logger.warning("Failed to build METAR string for %s", station_icao)
                     continue
+                
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Injecting METAR for %s (distance: %.1fnm): %s", station_icao, distance_nm, metar_bytes[:-1].decode('utf-8'))
+                metars.append(metar_bytes)
+                written.append((station_icao, key))
             
-            if success_count > 0:
-                logger.info(f"Injected METARs for {success_count} station(s) - FSX will blend them automatically")
-                # Final delay to let all writes process
-                time.sleep(0.2)
-                return True
-            else:
+            if not metars:
+                if unchanged:
+                    logger.info("METARs for %d station(s) unchanged since last write - nothing to inject", unchanged)
+                    return True
                 logger.warning("No stations were injected successfully")
+                self._last_validation = None
+                return False
+            
+            # Send all stations in one FSUIPC process call; FSUIPC applies the
+            # 0xB000 writes in order, so no delay is needed between stations
+            try:
+                self._prepared_metar_write(len(metars)).write(metars)
+            except Exception as e:
+                logger.warning("Failed to write METARs for %d station(s): %s", len(metars), e)
+                self._last_validation = None
                 return False
+            for station_icao, key in written:
+                self._last_written[station_icao] = (key, now)
+            
+            logger.info("Injected METARs for %d station(s) - FSX will blend them automatically", len(metars))
+            # Final delay to let FSUIPC hand the METARs to SimConnect
+            time.sleep(0.2)
+            return True
                 
         except Exception as e:
-            logger.error(f"Error injecting station METARs: {e}", exc_info=True)
+            logger.error("Error injecting station METARs: %s", e, exc_info=True)
+            self._last_validation = None
             return False
     
-    def _build_metar_from_parsed(self, parsed_metar, station_icao: str) -> Optional[str]:
-        """Build a METAR string from a parsed METAR object.
-        
-        Uses the raw METAR data directly, not blended weather.
-        """
-        from datetime import datetime
-        
-        parts = []
+    def _get_cached_metar_bytes(self, station_icao: str, parsed_metar, key: tuple, now: float) -> Optional[bytes]:
+        """Return null-terminated METAR bytes for a station, reusing cached bytes.
         
-        # Station identifier
-        parts.append(station_icao.upper())
-        parts.append("METAR")
+        The METAR is only rebuilt when the parsed weather differs from the cached
+        entry; otherwise the cached bytes are re-stamped with the current time.
         
-        # Date/time (format: DDHHMMZ) - use current UTC time
-        now = datetime.utcnow()
-        date_time = now.strftime("%d%H%MZ")
-        parts.append(date_time)
-        
-        # Wind
-        if parsed_metar.wind_dir_deg is not None and parsed_metar.wind_speed_kt is not None:
-            wind_dir = int(parsed_metar.wind_dir_deg) % 360
-            wind_speed = int(parsed_metar.wind_speed_kt)
-            if wind_speed >= 10 and wind_dir == 0:
-                wind_dir = 90
-            if wind_speed == 0:
-                parts.append("00000KT")
-            else:
-                parts.append(f"{wind_dir:03d}{wind_speed:02d}KT")
-                if parsed_metar.wind_gust_kt is not None and parsed_metar.wind_gust_kt > parsed_metar.wind_speed_kt:
-                    gust = int(parsed_metar.wind_gust_kt)
-                    parts[-1] = f"{wind_dir:03d}{wind_speed:02d}G{gust:02d}KT"
-        else:
-            parts.append("00000KT")
+        Args:
+            station_icao: Station ICAO code
+            parsed_metar: ParsedMETAR for the station
+            key: _metar_content_key() of parsed_metar
+            now: Current time.monotonic() value
         
-        # Visibility - convert to ICAO-style meter steps
-        if parsed_metar.visibility_nm is not None:
-            vis_m = parsed_metar.visibility_nm * 1852
-            if vis_m < 400:
-                vis_m = 400
-            if vis_m >= 10000:
-                parts.append("9999")
-            else:
-                # Determine visibility value based on ICAO steps
-                if vis_m >= 8000:
-                    vis_value = 8000
-                elif vis_m >= 5000:
-                    vis_value = 5000
-                elif vis_m >= 3000:
-                    vis_value = 3000
-                elif vis_m >= 1600:
-                    vis_value = 1600
-                elif vis_m >= 800:
-                    vis_value = 800
-                else:
-                    vis_value = 400
-                parts.append(f"{vis_value:04d}")
+        Returns:
+            Encoded METAR with null terminator, or None if it could not be built
+        """
+        cached = self._metar_cache.get(station_icao)
+        if cached is not None and cached[0] == key:
+            # DDHHMMZ follows "ICAO METAR " at a fixed offset
+            offset = len(station_icao) + 7
+            metar_bytes = cached[2][:offset] + _metar_time_bytes() + cached[2][offset + 7:]
         else:
-            parts.append("9999")
-        
-        # Weather phenomena
-        if hasattr(parsed_metar, 'weather_tokens') and parsed_metar.weather_tokens:
-            wx_codes = []
-            for token in parsed_metar.weather_tokens[:2]:
-                if "RA" in token.upper():
-                    wx_codes.append("RA")
-                elif "SN" in token.upper():
-                    wx_codes.append("SN")
-                elif "FG" in token.upper():
-                    wx_codes.append("FG")
-            if wx_codes:
-                parts.extend(wx_codes)
+            # Build METAR string from parsed METAR (use raw data, not blended)
+            metar = self._build_metar_from_parsed(parsed_metar, station_icao)
+            if not metar:
+                return None
+            # Add null terminator
+            metar_bytes = metar + b'\x00'
         
-        # Clouds
-        if hasattr(parsed_metar, 'clouds') and parsed_metar.clouds:
-            cloud_parts = []
-            for cloud in parsed_metar.clouds[:3]:
-                if hasattr(cloud, 'coverage') and hasattr(cloud, 'base_ft'):
-                    coverage = cloud.coverage
-                    base_ft = cloud.base_ft
-                    base_100ft = max(5, int(base_ft / 100))
-                    cov_map = {
-                        'FEW': 'FEW', 'SCT': 'SCT', 'BKN': 'BKN', 'OVC': 'OVC', 'CLR': 'SKC', 'SKC': 'SKC'
-                    }
-                    cov_code = cov_map.get(coverage, 'SCT')
-                    cloud_parts.append(f"{cov_code}{base_100ft:03d}")
-            if cloud_parts:
-                parts.extend(cloud_parts)
-        else:
-            parts.append("SKC")
+        self._metar_cache[station_icao] = (key, now, metar_bytes)
+        return metar_bytes
+    
+    def _prepared_metar_write(self, count: int):
+        """Return prepared FSUIPC data for writing `count` METARs to 0xB000.
         
-        # Temperature and dewpoint
-        if parsed_metar.temperature_c is not None:
-            temp = int(parsed_metar.temperature_c)
-            dewp = int(parsed_metar.dewpoint_c) if parsed_metar.dewpoint_c is not None else temp - 5
-            parts.append(f"{temp:02d}/{dewp:02d}")
+        Specifications are prepared once per FSUIPC connection and batch size.
+        Negative length = null-terminated string (max length is absolute value).
+        """
+        connection = self.fsuipc_bridge.connection
+        if connection is not self._prepared_connection:
+            self._prepared_writes.clear()
+            self._prepared_connection = connection
+        prepared = self._prepared_writes.get(count)
+        if prepared is None:
+            prepared = connection.prepare_data([(0xB000, -256)] * count, False)
+            self._prepared_writes[count] = prepared
+        return prepared
+    
+    def _is_duplicate_write(self, station_icao: str, key: tuple, now: float) -> bool:
+        """Check whether the same weather was written for the station recently.
+        
+        Compares content keys rather than METAR bytes, since the bytes carry the
+        current time and differ from one minute to the next. Unchanged weather is
+        still rewritten every _FSUIPC_REWRITE_INTERVAL_SECONDS, and the record is
+        cleared whenever the FSUIPC connection object changes, so weather is
+        always rewritten after a reconnect.
+        """
+        connection = self.fsuipc_bridge.connection
+        if connection is not self._last_written_connection:
+            self._last_written.clear()
+            self._last_written_connection = connection
+        last = self._last_written.get(station_icao)
+        return last is not None and last[0] == key and now - last[1] < _FSUIPC_REWRITE_INTERVAL_SECONDS
+    
+    def _evict_stale_metars(self, now: float) -> None:
+        """Drop cached METAR bytes for stations not injected in the last 10 minutes."""
+        stale = [icao for icao, entry in self._metar_cache.items() if now - entry[1] > _METAR_CACHE_TTL_SECONDS]
+        for icao in stale:
+            del self._metar_cache[icao]
+    
+    def _build_metar_from_parsed(self, parsed_metar, station_icao: str) -> Optional[bytes]:
+        """Build an encoded METAR from a parsed METAR object.
         
-        # QNH (pressure)
-        if parsed_metar.qnh_hpa is not None:
-            qnh = parsed_metar.qnh_hpa
-            if not (870 <= qnh <= 1080):
-                logger.warning(f"QNH value {qnh} hPa is out of normal range for {station_icao}, using default 1013 hPa")
-                qnh = 1013.25
-            parts.append(f"Q{int(round(qnh))}")
-        else:
-            parts.append("Q1013")
+        Uses the raw METAR data directly, not blended weather.
+        """
+        weather_tokens = getattr(parsed_metar, 'weather_tokens', None)
+        wx_groups = _weather_codes(weather_tokens[:2]) if weather_tokens else []
+        
+        clouds = getattr(parsed_metar, 'clouds', None)
+        cloud_layers = None
+        if clouds:
+            cloud_layers = []
+            for cloud in clouds[:3]:
+                try:
+                    cloud_layers.append((cloud.coverage, cloud.base_ft))
+                except AttributeError:
+                    continue
         
-        return " ".join(parts)
+        return _build_metar_from_fields(
+            _station_header(station_icao),
+            parsed_metar.wind_dir_deg,
+            parsed_metar.wind_speed_kt,
+            parsed_metar.wind_gust_kt,
+            parsed_metar.visibility_nm,
+            wx_groups,
+            cloud_layers,
+            parsed_metar.temperature_c,
+            parsed_metar.dewpoint_c,
+            parsed_metar.qnh_hpa,
+            station_label=f" for {station_icao}",
+        )
     
     def _validate_station_consistency(self, stations_with_metars: List[Tuple[str, object, float]]) -> List[Tuple[str, object, float]]:
         """Validate stations for weather consistency with nearby stations.
@@ -353,32 +679,39 @@ class FSUIPCWeatherInjector(WeatherInjector):
             # Can't validate consistency with only one station
             return stations_with_metars
         
-        validated = []
+        # The result only depends on the METAR objects and which stations are
+        # within 20nm, so reuse the last result while those are unchanged
+        signature = [(icao, metar, dist <= 20.0) for icao, metar, dist in stations_with_metars]
+        cached = self._last_validation
+        if cached is not None and cached[0] == signature:
+            return [stations_with_metars[i] for i in cached[1]]
+        
+        kept = []
         rejected = []
         
-        for i, (station_icao, parsed_metar, distance_nm) in enumerate(stations_with_metars):
+        # Valid stations within 20nm form the comparison pool for every station
+        candidates = [
+            (icao, metar.visibility_nm, metar.qnh_hpa) for icao, metar, dist in stations_with_metars
+            if dist <= 20.0 and metar and getattr(metar, 'valid', False)
+        ]
+        
+        for index, (station_icao, parsed_metar, distance_nm) in enumerate(stations_with_metars):
             if not parsed_metar or not getattr(parsed_metar, 'valid', False):
-                validated.append((station_icao, parsed_metar, distance_nm))
+                kept.append(index)
                 continue
             
             # Compare with other nearby stations (within 20nm)
-            nearby_stations = [
-                (icao, metar, dist) for icao, metar, dist in stations_with_metars
-                if icao != station_icao and dist <= 20.0 and metar and getattr(metar, 'valid', False)
-            ]
+            nearby_stations = [(vis, qnh) for icao, vis, qnh in candidates if icao != station_icao]
             
             if not nearby_stations:
                 # No nearby stations to compare - accept it
-                validated.append((station_icao, parsed_metar, distance_nm))
+                kept.append(index)
                 continue
             
             # Check visibility consistency
             station_vis = parsed_metar.visibility_nm
             if station_vis is not None:
-                nearby_visibilities = [
-                    metar.visibility_nm for _, metar, _ in nearby_stations
-                    if metar.visibility_nm is not None
-                ]
+                nearby_visibilities = [vis for vis, _ in nearby_stations if vis is not None]
                 
                 if nearby_visibilities:
                     avg_nearby_vis = sum(nearby_visibilities) / len(nearby_visibilities)
@@ -388,17 +721,14 @@ class FSUIPCWeatherInjector(WeatherInjector):
                     if vis_diff > 5.0:
                         # Check if it's a significant mismatch (e.g., 0.2nm vs 10nm, or 10nm vs 0.2nm)
                         if (station_vis < 1.0 and avg_nearby_vis > 5.0) or (station_vis > 5.0 and avg_nearby_vis < 1.0):
-                            logger.warning(f"Skipping {station_icao}: inconsistent visibility ({station_vis:.1f}nm vs nearby avg {avg_nearby_vis:.1f}nm, diff: {vis_diff:.1f}nm)")
+                            logger.warning("Skipping %s: inconsistent visibility (%.1fnm vs nearby avg %.1fnm, diff: %.1fnm)", station_icao, station_vis, avg_nearby_vis, vis_diff)
                             rejected.append((station_icao, "visibility", vis_diff))
                             continue
             
             # Check QNH consistency (should be similar within ~50nm)
             station_qnh = parsed_metar.qnh_hpa
             if station_qnh is not None:
-                nearby_qnhs = [
-                    metar.qnh_hpa for _, metar, _ in nearby_stations
-                    if metar.qnh_hpa is not None
-                ]
+                nearby_qnhs = [qnh for _, qnh in nearby_stations if qnh is not None]
                 
                 if nearby_qnhs:
                     avg_nearby_qnh = sum(nearby_qnhs) / len(nearby_qnhs)
@@ -406,17 +736,18 @@ class FSUIPCWeatherInjector(WeatherInjector):
                     
                     # QNH should be within ~10hPa of nearby stations (unless very far away)
                     if qnh_diff > 10.0 and distance_nm <= 20.0:
-                        logger.warning(f"Skipping {station_icao}: inconsistent QNH ({station_qnh:.1f}hPa vs nearby avg {avg_nearby_qnh:.1f}hPa, diff: {qnh_diff:.1f}hPa)")
+                        logger.warning("Skipping %s: inconsistent QNH (%.1fhPa vs nearby avg %.1fhPa, diff: %.1fhPa)", station_icao, station_qnh, avg_nearby_qnh, qnh_diff)
                         rejected.append((station_icao, "QNH", qnh_diff))
                         continue
             
             # Station passed validation
-            validated.append((station_icao, parsed_metar, distance_nm))
+            kept.append(index)
         
-        if rejected:
-            logger.info(f"Filtered out {len(rejected)} inconsistent station(s): {[r[0] for r in rejected]}")
+        if rejected and logger.isEnabledFor(logging.INFO):
+            logger.info("Filtered out %d inconsistent station(s): %s", len(rejected), [r[0] for r in rejected])
         
-        return validated
+        self._last_validation = (signature, kept)
+        return [stations_with_metars[i] for i in kept]
     
     def inject_weather(self, weather: WeatherState, aircraft_lat: Optional[float] = None, aircraft_lon: Optional[float] = None, station_icao: Optional[str] = None) -> bool:
         """Inject weather via FSUIPC by writing METAR string to offset 0xB000.
@@ -455,7 +786,7 @@ class FSUIPCWeatherInjector(WeatherInjector):
             if station_icao:
                 # Use provided station ICAO
                 injection_icao = station_icao.upper()
-                logger.info(f"Using provided station ICAO for FSUIPC injection: {injection_icao}")
+                logger.info("Using provided station ICAO for FSUIPC injection: %s", injection_icao)
             elif aircraft_lat is not None and aircraft_lon is not None:
                 # Find nearest station based on config settings
                 if not self.station_db:
@@ -470,36 +801,51 @@ class FSUIPCWeatherInjector(WeatherInjector):
                     
                     # Validate aircraft position
                     if abs(aircraft_lat) > 90 or abs(aircraft_lon) > 180:
-                        logger.error(f"Invalid aircraft position: lat={aircraft_lat:.6f}, lon={aircraft_lon:.6f}")
+                        logger.error("Invalid aircraft position: lat=%.6f, lon=%.6f", aircraft_lat, aircraft_lon)
                         return False
                     
-                    logger.debug(f"Searching for stations near lat={aircraft_lat:.6f}, lon={aircraft_lon:.6f}, radius={radius_nm:.1f}nm")
-                    logger.debug(f"Station database has {len(self.station_db.stations)} stations loaded")
+                    # Reuse the last lookup while the aircraft stays in the same ~6nm cell
+                    cell = (round(aircraft_lat * 10), round(aircraft_lon * 10), radius_nm)
+                    now = time.monotonic()
+                    cached = self._station_cache
+                    if cached is not None and cached[0] == cell and now - cached[1] < _STATION_CACHE_TTL_SECONDS:
+                        injection_icao = cached[2]
+                        logger.debug("Reusing nearest station for FSUIPC injection: %s", injection_icao)
+                    else:
+                        logger.debug("Searching for stations near lat=%.6f, lon=%.6f, radius=%.1fnm", aircraft_lat, aircraft_lon, radius_nm)
+                        logger.debug("Station database has %d stations loaded", len(self.station_db.stations))
                     
-                    nearest = self.station_db.find_nearest_stations(
-                        aircraft_lat, 
-                        aircraft_lon, 
-                        radius_nm=radius_nm,
-                        max_results=1,
-                        fallback_to_global=False  # Never fall back to global
-                    )
+                        nearest = self.station_db.find_nearest_stations(
+                            aircraft_lat, 
+                            aircraft_lon, 
+                            radius_nm=radius_nm,
+                            max_results=1,
+                            fallback_to_global=False  # Never fall back to global
+                        )
                     
-                    if nearest:
-                        injection_icao = nearest[0][0].icao
-                        distance = nearest[0][1]
-                        logger.info(f"Found nearest station for FSUIPC injection: {injection_icao} (distance: {distance:.1f}nm, radius: {radius_nm:.1f}nm)")
-                    else:
-                        logger.warning(f"No station found within {radius_nm:.1f}nm of aircraft position (lat={aircraft_lat:.6f}, lon={aircraft_lon:.6f})")
-                        logger.warning(f"Station database has {len(self.station_db.stations)} stations - may need to increase radius or check position")
-                        logger.warning("Cannot inject weather without a station - GLOB is not used")
-                        return False
+                        if nearest:
+                            injection_icao = nearest[0][0].icao
+                            distance = nearest[0][1]
+                            logger.info("Found nearest station for FSUIPC injection: %s (distance: %.1fnm, radius: %.1fnm)", injection_icao, distance, radius_nm)
+                            self._station_cache = (cell, now, injection_icao)
+                        else:
+                            logger.warning("No station found within %.1fnm of aircraft position (lat=%.6f, lon=%.6f)", radius_nm, aircraft_lat, aircraft_lon)
+                            logger.warning("Station database has %d stations - may need to increase radius or check position", len(self.station_db.stations))
+                            logger.warning("Cannot inject weather without a station - GLOB is not used")
+                            return False
                 except Exception as e:
-                    logger.error(f"Could not find nearest station: {e}", exc_info=True)
+                    logger.error("Could not find nearest station: %s", e, exc_info=True)
                     return False
             else:
                 logger.warning("No aircraft position or station ICAO provided - cannot inject weather (station-based only)")
                 return False
             
+            key = _weather_state_key(weather)
+            now = time.monotonic()
+            if self._is_duplicate_write(injection_icao, key, now):
+                logger.debug("Skipping FSUIPC write for %s: METAR unchanged since last write", injection_icao)
+                return True
+            
             # Build METAR string with station ICAO (never GLOB)
             metar = self._build_metar_string(weather, aircraft_lat, aircraft_lon, station_icao=injection_icao)
             
@@ -507,18 +853,20 @@ class FSUIPCWeatherInjector(WeatherInjector):
                 logger.warning("Failed to build METAR string for FSUIPC")
                 return False
             
-            # Convert to bytes with null terminator
-            metar_bytes = metar.encode('utf-8') + b'\x00'
+            # Add null terminator
+            metar_bytes = metar + b'\x00'
             
-            logger.info(f"Writing station METAR to FSUIPC 0xB000: {metar}")
-            logger.info(f"METAR bytes: {len(metar_bytes)} bytes (string: {len(metar)} chars)")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Writing station METAR to FSUIPC 0xB000: %s", metar.decode('utf-8'))
+                logger.info("METAR bytes: %d bytes (string: %d chars)", len(metar_bytes), len(metar))
             
             # Write to FSUIPC offset 0xB000 ONLY (no C800 commands needed per Pete Dowson)
             # Negative length = null-terminated string (max length is absolute value)
             # Using -256 to allow up to 255 characters (typical METAR is ~80 chars)
-            self.fsuipc_bridge.connection.write([(0xB000, -256, metar_bytes)])
+            self._prepared_metar_write(1).write([metar_bytes])
+            self._last_written[injection_icao] = (key, now)
             
-            logger.info(f"FSUIPC write completed for station {injection_icao}")
+            logger.info("FSUIPC write completed for station %s", injection_icao)
             
             # Small delay to let FSUIPC/SimConnect process the write
             time.sleep(0.2)
@@ -526,10 +874,10 @@ class FSUIPCWeatherInjector(WeatherInjector):
             return True
             
         except FSUIPCException as e:
-            logger.error(f"FSUIPC error injecting weather: {e}")
+            logger.error("FSUIPC error injecting weather: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Error injecting weather via FSUIPC: {e}")
+            logger.error("Error injecting weather via FSUIPC: %s", e)
             return False
     
     def _ensure_simconnect_custom_mode(self) -> None:
@@ -538,148 +886,64 @@ class FSUIPCWeatherInjector(WeatherInjector):
         Since FSUIPC sends METAR to SimConnect, SimConnect should be in Custom mode.
         This is optional - if SimConnect isn't available, we continue anyway.
         """
-        if not SIMCONNECT_AVAILABLE:
+        if _get_simconnect_dll() is None:
             return
         
         try:
-            # Try to open SimConnect just for mode setting
-            hSimConnect = c_void_p()
-            result = SimConnectDLL.SimConnect_Open(
-                byref(hSimConnect),
-                b"FSXWeatherBridge",
-                None,
-                0,
-                None,
-                SIMCONNECT_OPEN_CONFIGINDEX_LOCAL
-            )
+            # Keep one SimConnect connection open for mode setting; reopen only after a failure
+            if self._hSimConnect is None:
+                hSimConnect = c_void_p()
+                result = SimConnectDLL.SimConnect_Open(
+                    byref(hSimConnect),
+                    b"FSXWeatherBridge",
+                    None,
+                    0,
+                    None,
+                    SIMCONNECT_OPEN_CONFIGINDEX_LOCAL
+                )
+                if result != 0:
+                    return
+                self._hSimConnect = hSimConnect
             
-            if result == 0:
-                try:
-                    # Set Custom mode
-                    SimConnectDLL.SimConnect_WeatherSetModeCustom(hSimConnect)
-                    # Pump dispatch a few times
-                    for _ in range(5):
-                        SimConnectDLL.SimConnect_CallDispatch(hSimConnect, None, None)
-                    logger.debug("Set SimConnect to Custom mode for FSUIPC weather injection")
-                finally:
-                    # Close the temporary connection
-                    SimConnectDLL.SimConnect_Close(hSimConnect)
+            # Set Custom mode
+            result = SimConnectDLL.SimConnect_WeatherSetModeCustom(self._hSimConnect)
+            if result != 0:
+                logger.debug("WeatherSetModeCustom returned error code %s, reopening SimConnect on next injection", result)
+                self.disconnect()
+                return
+            # Pump dispatch a few times
+            call_dispatch = SimConnectDLL.SimConnect_CallDispatch
+            for _ in range(5):
+                call_dispatch(self._hSimConnect, None, None)
+            logger.debug("Set SimConnect to Custom mode for FSUIPC weather injection")
         except Exception as e:
-            logger.debug(f"Could not set SimConnect Custom mode (non-critical): {e}")
+            logger.debug("Could not set SimConnect Custom mode (non-critical): %s", e)
+            self.disconnect()
+    
+    def disconnect(self) -> None:
+        """Close the SimConnect connection used for setting Custom mode."""
+        if self._hSimConnect is not None:
+            try:
+                SimConnectDLL.SimConnect_Close(self._hSimConnect)
+            except Exception:
+                pass
+            self._hSimConnect = None
     
-    def _build_metar_string(self, weather: WeatherState, lat: Optional[float] = None, lon: Optional[float] = None, station_icao: Optional[str] = None) -> Optional[str]:
-        """Build a METAR string from weather state (same format as SimConnect).
+    def _build_metar_string(self, weather: WeatherState, lat: Optional[float] = None, lon: Optional[float] = None, station_icao: Optional[str] = None) -> Optional[bytes]:
+        """Build an encoded METAR from weather state (same format as SimConnect).
         
         This is the same logic as SimConnectInjector._build_metar_string().
         FSUIPC sends the METAR string to SimConnect, so the format must match.
         """
-        from datetime import datetime
-        
-        parts = []
-        
         # Station identifier: ALWAYS use station ICAO (never GLOB)
         # GLOB overwrites station weather and prevents FSX from blending
         if station_icao:
-            parts.append(station_icao.upper())
-            parts.append("METAR")
+            header = _station_header(station_icao)
         else:
             # This should never happen in FSUIPCWeatherInjector, but handle gracefully
             logger.warning("No station ICAO provided - using GLOB (not recommended)")
-            parts.append("GLOB")
-        
-        # Date/time (format: DDHHMMZ) - use current UTC time
-        now = datetime.utcnow()
-        date_time = now.strftime("%d%H%MZ")
-        parts.append(date_time)
-        
-        # Wind. Avoid 000ddKT when speed>=10 (calm direction at high speed edge case)
-        if weather.wind_dir_deg is not None and weather.wind_speed_kt is not None:
-            wind_dir = int(weather.wind_dir_deg) % 360
-            wind_speed = int(weather.wind_speed_kt)
-            if wind_speed >= 10 and wind_dir == 0:
-                wind_dir = 90
-            if wind_speed == 0:
-                parts.append("00000KT")
-            else:
-                parts.append(f"{wind_dir:03d}{wind_speed:02d}KT")
-                if weather.wind_gust_kt is not None and weather.wind_gust_kt > weather.wind_speed_kt:
-                    gust = int(weather.wind_gust_kt)
-                    parts[-1] = f"{wind_dir:03d}{wind_speed:02d}G{gust:02d}KT"
-        else:
-            parts.append("00000KT")
-        
-        # Visibility - use ICAO-style meter steps
-        if weather.visibility_nm is not None:
-            vis_m = int(weather.visibility_nm * 1852)
-            if vis_m < 400:
-                vis_m = 400
-            if vis_m >= 10000:
-                parts.append("9999")
-            else:
-                if vis_m >= 8000:
-                    vis_value = 8000
-                elif vis_m >= 5000:
-                    vis_value = 5000
-                elif vis_m >= 3000:
-                    vis_value = 3000
-                elif vis_m >= 1600:
-                    vis_value = 1600
-                elif vis_m >= 800:
-                    vis_value = 800
-                else:
-                    vis_value = 400
-                parts.append(f"{vis_value:04d}")
-        else:
-            parts.append("9999")
-        
-        # Weather phenomena
-        if weather.weather_tokens:
-            wx_codes = []
-            for token in weather.weather_tokens:
-                if "RA" in token.upper():
-                    wx_codes.append("RA")
-                elif "SN" in token.upper():
-                    wx_codes.append("SN")
-                elif "FG" in token.upper():
-                    wx_codes.append("FG")
-            if wx_codes:
-                parts.append("".join(wx_codes[:2]))
-        
-        # Clouds (OVC000/BKN000 often invalid in FSX; use minimum 005 = 500 ft)
-        if weather.clouds:
-            cloud_parts = []
-            for cloud in weather.clouds[:3]:
-                if isinstance(cloud, dict):
-                    coverage = cloud.get('coverage', 'SCT')
-                    base_ft = cloud.get('base_ft', 3000)
-                    base_100ft = max(5, int(base_ft / 100))
-                    cov_map = {
-                        'FEW': 'FEW', 'SCT': 'SCT', 'BKN': 'BKN', 'OVC': 'OVC', 'CLR': 'SKC'
-                    }
-                    cov_code = cov_map.get(coverage, 'SCT')
-                    cloud_parts.append(f"{cov_code}{base_100ft:03d}")
-            if cloud_parts:
-                parts.extend(cloud_parts)
-        else:
-            parts.append("SKC")
-        
-        # Temperature and dewpoint
-        if weather.temperature_c is not None:
-            temp = int(weather.temperature_c)
-            dewp = int(weather.dewpoint_c) if weather.dewpoint_c is not None else temp - 5
-            parts.append(f"{temp:02d}/{dewp:02d}")
-        
-        # QNH (pressure)
-        if weather.qnh_hpa is not None:
-            qnh = weather.qnh_hpa
-            if not (870 <= qnh <= 1080):
-                logger.warning(f"QNH value {qnh} hPa is out of normal range, using default 1013 hPa")
-                qnh = 1013.25
-            parts.append(f"Q{int(round(qnh))}")
-        else:
-            parts.append("Q1013")
-        
-        return " ".join(parts)
+            header = b"GLOB"
+        return _build_weather_state_metar(header, weather)
     
     def inject_raw_metar(self, metar: str) -> bool:
         """Inject a raw METAR string directly via FSUIPC offset 0xB000."""
@@ -691,7 +955,8 @@ class FSUIPCWeatherInjector(WeatherInjector):
         if not metar:
             return False
         try:
-            metar_bytes = metar.encode('utf-8') + b'\x00'
+            # METARs are ASCII; one encode of the terminated string allocates a single buffer
+            metar_bytes = (metar + '\x00').encode('ascii', errors='replace')
             self.fsuipc_bridge.connection.write([(0xB000, -256, metar_bytes)])
             logger.info(f"FSUIPC raw METAR injection: {metar}")
             return True
@@ -703,119 +968,88 @@ class FSUIPCWeatherInjector(WeatherInjector):
 class SimConnectInjector(WeatherInjector):
     """SimConnect-based injector for FSX."""
     
-    def __init__(self):
-        if not SIMCONNECT_AVAILABLE:
+    def __init__(self, station_db=None):
+        """Initialize SimConnect weather injector.
+        
+        Args:
+            station_db: Optional StationDatabase to share; loaded on first use if omitted
+        """
+        if _get_simconnect_dll() is None:
             raise RuntimeError("SimConnect.dll not available. Cannot initialize SimConnectInjector.")
         
         self.hSimConnect = c_void_p()
         self.connected = False
-        self._setup_simconnect_functions()
+        # Last successfully injected weather: (weather key, monotonic time)
+        self._last_key: Optional[tuple] = None
+        self._last_inject_time = 0.0
+        # Background dispatch loop; the lock serializes SimConnect calls on the handle
+        self._dispatch_lock = threading.Lock()
+        self._dispatch_wake = threading.Event()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        # Station database, loaded on the first nearest-station lookup unless shared
+        self._station_db = station_db
+        # Last nearest-station lookup: (position cell, time, icao or None for global)
+        self._station_cache: Optional[Tuple[tuple, float, Optional[str]]] = None
         self._connect()
         # Store last mode set time to periodically re-enforce
         self.last_mode_set_time = 0
     
-    def _setup_simconnect_functions(self):
-        """Setup SimConnect function signatures."""
-        try:
-            # SimConnect_Open
-            SimConnectDLL.SimConnect_Open.argtypes = [POINTER(c_void_p), c_char_p, c_void_p, c_uint, c_void_p, c_uint]
-            SimConnectDLL.SimConnect_Open.restype = c_int
-            
-            # SimConnect_Close
-            SimConnectDLL.SimConnect_Close.argtypes = [c_void_p]
-            SimConnectDLL.SimConnect_Close.restype = c_int
-            
-            # SimConnect_WeatherSetObservation
-            # Signature: SimConnect_WeatherSetObservation(HANDLE hSimConnect, DWORD Seconds, const char* szMETAR)
-            # Parameters: hSimConnect, Seconds (time until observation), METAR string
-            SimConnectDLL.SimConnect_WeatherSetObservation.argtypes = [
-                c_void_p,
-                c_uint,  # Seconds until observation takes effect
-                c_char_p  # METAR string (must start with "GLOB" for global weather)
-            ]
-            SimConnectDLL.SimConnect_WeatherSetObservation.restype = c_int
-            
-            # SimConnect_WeatherSetModeServer
-            SimConnectDLL.SimConnect_WeatherSetModeServer.argtypes = [
-                c_void_p,
-                c_uint,
-                c_uint
-            ]
-            SimConnectDLL.SimConnect_WeatherSetModeServer.restype = c_int
-            
-            # SimConnect_WeatherSetModeCustom
-            SimConnectDLL.SimConnect_WeatherSetModeCustom.argtypes = [
-                c_void_p
-            ]
-            SimConnectDLL.SimConnect_WeatherSetModeCustom.restype = c_int
-            
-            # SimConnect_WeatherSetModeGlobal
-            SimConnectDLL.SimConnect_WeatherSetModeGlobal.argtypes = [
-                c_void_p
-            ]
-            SimConnectDLL.SimConnect_WeatherSetModeGlobal.restype = c_int
-            
-            # SimConnect_WeatherSetModeTheme
-            SimConnectDLL.SimConnect_WeatherSetModeTheme.argtypes = [
-                c_void_p,
-                c_char_p
-            ]
-            SimConnectDLL.SimConnect_WeatherSetModeTheme.restype = c_int
-            
-            # SimConnect_CallDispatch
-            SimConnectDLL.SimConnect_CallDispatch.argtypes = [c_void_p, c_void_p, c_void_p]
-            SimConnectDLL.SimConnect_CallDispatch.restype = c_int
-            
-            logger.info("SimConnect function signatures configured")
-        except Exception as e:
-            logger.error(f"Failed to setup SimConnect functions: {e}")
-            raise
-    
     def _connect(self) -> bool:
         """Connect to SimConnect."""
         try:
-            result = SimConnectDLL.SimConnect_Open(
-                byref(self.hSimConnect),
-                b"FSXWeatherBridge",
-                None,
-                0,
-                None,
-                SIMCONNECT_OPEN_CONFIGINDEX_LOCAL
-            )
+            with self._dispatch_lock:
+                result = SimConnectDLL.SimConnect_Open(
+                    byref(self.hSimConnect),
+                    b"FSXWeatherBridge",
+                    None,
+                    0,
+                    None,
+                    SIMCONNECT_OPEN_CONFIGINDEX_LOCAL
+                )
             
             if result == 0:  # SUCCESS
                 self.connected = True
+                self._last_key = None  # A new connection needs the weather again
                 logger.info("Connected to SimConnect")
                 
                 # CRITICAL: Set Custom mode ONCE after connect (and again on reconnect).
                 # FSX must be in Custom mode before WeatherSetObservation takes effect.
                 # Skipping WeatherSetModeCustom is a common reason for "returns success, no visible change".
                 try:
-                    result_custom = SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
+                    with self._dispatch_lock:
+                        result_custom = SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
                     if result_custom == 0:
                         logger.info("Set SimConnect weather mode to custom (WeatherSetModeCustom)")
                     else:
-                        logger.warning(f"WeatherSetModeCustom returned error code: {result_custom}")
+                        logger.warning("WeatherSetModeCustom returned error code: %s", result_custom)
                 except Exception as e:
-                    logger.warning(f"Failed to set weather mode via WeatherSetModeCustom: {e}")
+                    logger.warning("Failed to set weather mode via WeatherSetModeCustom: %s", e)
                 
                 # Pump SimConnect dispatch so the mode change is processed.
-                # Ideally run a continuous dispatch loop (SimConnect_GetNextDispatch) in a background
-                # thread; without it, commands may not reach FSX even if the API returns 0.
-                self._pump_dispatch(20)
+                # A background thread keeps dispatching for as long as we are connected;
+                # without it, commands may not reach FSX even if the API returns 0.
+                self._start_dispatch_thread()
+                self._request_dispatch()
                 time.sleep(0.1)
                 
                 self.last_mode_set_time = time.time()
                 return True
             else:
-                logger.error(f"Failed to connect to SimConnect. Error code: {result}")
+                logger.error("Failed to connect to SimConnect. Error code: %s", result)
                 self.connected = False
                 return False
         except Exception as e:
-            logger.error(f"Exception connecting to SimConnect: {e}")
+            logger.error("Exception connecting to SimConnect: %s", e)
             self.connected = False
             return False
     
+    def _get_station_db(self):
+        """Return the station database, loading it once for the injector's lifetime."""
+        if self._station_db is None:
+            from src.stations import StationDatabase
+            self._station_db = StationDatabase()
+        return self._station_db
+    
     def _pump_dispatch(self, n: int = 50) -> None:
         """Run SimConnect_CallDispatch n times to process pending messages.
         
@@ -824,23 +1058,48 @@ class SimConnectInjector(WeatherInjector):
         not reach FSX even when the API returns 0.
         """
         try:
-            for _ in range(n):
-                SimConnectDLL.SimConnect_CallDispatch(self.hSimConnect, None, None)
+            with self._dispatch_lock:
+                if not self.connected:
+                    return
+                # Bind the function pointer and handle once; the loop is then a bare ctypes call
+                call_dispatch = SimConnectDLL.SimConnect_CallDispatch
+                handle = self.hSimConnect
+                for _ in range(n):
+                    call_dispatch(handle, None, None)
         except Exception as e:
-            logger.debug(f"Error in dispatch pump: {e}")
+            logger.debug("Error in dispatch pump: %s", e)
+    
+    def _start_dispatch_thread(self) -> None:
+        """Start the background dispatch loop unless one is already running."""
+        if self._dispatch_thread is not None and self._dispatch_thread.is_alive():
+            return
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, name="SimConnectDispatch", daemon=True)
+        self._dispatch_thread.start()
+    
+    def _dispatch_loop(self) -> None:
+        """Pump SimConnect while connected: a burst when woken, a single call when idle."""
+        while self.connected:
+            woken = self._dispatch_wake.wait(_DISPATCH_IDLE_SECONDS)
+            self._dispatch_wake.clear()
+            self._pump_dispatch(_DISPATCH_BURST if woken else 1)
+    
+    def _request_dispatch(self) -> None:
+        """Wake the dispatch loop so just-issued commands are flushed without blocking the caller."""
+        self._dispatch_wake.set()
     
     def _ensure_custom_mode(self) -> None:
         """Re-enforce custom weather mode periodically (FSX may switch back to Real-World)."""
         current_time = time.time()
         if current_time - self.last_mode_set_time > 5.0:
             try:
-                result_mode = SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
+                with self._dispatch_lock:
+                    result_mode = SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
                 if result_mode == 0:
-                    self._pump_dispatch(5)
+                    self._request_dispatch()
                     self.last_mode_set_time = current_time
                     logger.debug("Re-enforced custom weather mode")
             except Exception as e:
-                logger.debug(f"Could not re-enforce custom mode: {e}")
+                logger.debug("Could not re-enforce custom mode: %s", e)
     
     def inject_weather(self, weather: WeatherState, aircraft_lat: Optional[float] = None, aircraft_lon: Optional[float] = None, station_icao: Optional[str] = None) -> bool:
         """Inject weather via SimConnect using METAR string.
@@ -870,22 +1129,35 @@ class SimConnectInjector(WeatherInjector):
                 # Use provided station ICAO
                 use_station = True
                 injection_icao = station_icao.upper()
-                logger.info(f"Using provided station ICAO: {injection_icao}")
+                logger.info("Using provided station ICAO: %s", injection_icao)
             elif aircraft_lat is not None and aircraft_lon is not None:
                 # Try to find nearest station for station-specific injection
                 # This is more reliable than GLOB in some FSX setups
                 try:
-                    from src.stations import StationDatabase
-                    station_db = StationDatabase()
-                    nearest = station_db.find_nearest_stations(aircraft_lat, aircraft_lon, radius_nm=50.0, max_results=1)
-                    if nearest:
-                        injection_icao = nearest[0][0].icao
-                        use_station = True
-                        logger.info(f"Using nearest station for injection: {injection_icao} (distance: {nearest[0][1]:.1f}nm)")
+                    # Reuse the last lookup while the aircraft stays in the same ~6nm cell
+                    cell = (round(aircraft_lat * 10), round(aircraft_lon * 10))
+                    now = time.monotonic()
+                    cached = self._station_cache
+                    if cached is not None and cached[0] == cell and now - cached[1] < _STATION_CACHE_TTL_SECONDS:
+                        injection_icao = cached[2]
                     else:
-                        logger.info("No nearby station found, using global injection")
+                        nearest = self._get_station_db().find_nearest_stations(aircraft_lat, aircraft_lon, radius_nm=50.0, max_results=1)
+                        if nearest:
+                            injection_icao = nearest[0][0].icao
+                            logger.info("Using nearest station for injection: %s (distance: %.1fnm)", injection_icao, nearest[0][1])
+                        else:
+                            logger.info("No nearby station found, using global injection")
+                        self._station_cache = (cell, now, injection_icao)
+                    use_station = injection_icao is not None
                 except Exception as e:
-                    logger.debug(f"Could not find nearest station: {e}, using global injection")
+                    logger.debug("Could not find nearest station: %s, using global injection", e)
+            
+            # Skip the injection if the same weather went to the same station recently
+            key = (_weather_state_key(weather), injection_icao if use_station else None)
+            now = time.monotonic()
+            if key == self._last_key and now - self._last_inject_time < _REINJECT_INTERVAL_SECONDS:
+                logger.debug("Weather unchanged since last SimConnect injection, skipping")
+                return True
             
             # Build METAR string from weather state
             metar = self._build_metar_string(weather, aircraft_lat, aircraft_lon, station_icao=injection_icao if use_station else None)
@@ -894,45 +1166,46 @@ class SimConnectInjector(WeatherInjector):
                 logger.warning("Failed to build METAR string")
                 return False
             
-            # Convert METAR to bytes (ensure null-terminated)
-            metar_bytes = metar.encode('utf-8') + b'\x00'
-            
-            # Set Custom mode before observation (required; also done once at connect/reconnect).
-            try:
-                SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
-                self._pump_dispatch(10)
-            except Exception as e:
-                logger.warning(f"Error setting Custom mode before injection: {e}")
+            # Ensure null-terminated; decode a copy for the log only if INFO is enabled
+            metar_bytes = metar + b'\x00'
+            log_info = logger.isEnabledFor(logging.INFO)
+            if log_info:
+                metar = metar.decode('utf-8')
             
+            # Custom mode is required before the observation; it is set at connect/reconnect
+            # and re-enforced every 5s by _ensure_custom_mode() above.
             # SimConnect_WeatherSetObservation(hSimConnect, 0, "<METAR>")
-            logger.info(f"Calling SimConnect_WeatherSetObservation with METAR: {metar}")
-            result = SimConnectDLL.SimConnect_WeatherSetObservation(
-                self.hSimConnect,
-                0,  # Seconds=0 for immediate
-                metar_bytes
-            )
-            logger.info(f"SimConnect_WeatherSetObservation returned: {result} (0=success, non-zero=error)")
+            if log_info:
+                logger.info("Calling SimConnect_WeatherSetObservation with METAR: %s", metar)
+            with self._dispatch_lock:
+                result = SimConnectDLL.SimConnect_WeatherSetObservation(
+                    self.hSimConnect,
+                    _C_SECONDS_IMMEDIATE,  # Seconds=0 for immediate
+                    metar_bytes
+                )
+            if log_info:
+                logger.info("SimConnect_WeatherSetObservation returned: %s (0=success, non-zero=error)", result)
             
-            # Pump dispatch so the observation is processed. SimConnect needs this;
-            # without a dispatch loop, observations may not be applied.
-            self._pump_dispatch(50)
+            # Wake the dispatch loop so the observation is processed. SimConnect needs this;
+            # without dispatching, observations may not be applied.
+            self._request_dispatch()
             
             if result == 0:
-                logger.info(f"Weather injection succeeded. METAR: {metar}, method={'station' if use_station else 'global'}")
-                try:
-                    SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
-                    self._pump_dispatch(5)
-                except Exception:
-                    pass
+                if log_info:
+                    logger.info("Weather injection succeeded. METAR: %s, method=%s", metar, 'station' if use_station else 'global')
+                self._last_key = key
+                self._last_inject_time = now
                 return True
             else:
-                logger.error(f"SimConnect_WeatherSetObservation failed. Error code: {result}")
+                logger.error("SimConnect_WeatherSetObservation failed. Error code: %s", result)
+                self._last_key = None
                 return False
                 
         except Exception as e:
-            logger.error(f"Error injecting weather via SimConnect: {e}")
+            logger.error("Error injecting weather via SimConnect: %s", e)
             # Try to reconnect on error
             self.connected = False
+            self._last_key = None
             return False
     
     def inject_raw_metar(self, metar: str) -> bool:
@@ -943,23 +1216,23 @@ class SimConnectInjector(WeatherInjector):
         if not metar:
             return False
         try:
-            SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
-            self._pump_dispatch(10)
-            metar_bytes = metar.encode('utf-8') + b'\x00'
-            result = SimConnectDLL.SimConnect_WeatherSetObservation(self.hSimConnect, 0, metar_bytes)
-            self._pump_dispatch(50)
+            metar_bytes = (metar + '\x00').encode('ascii', errors='replace')
+            with self._dispatch_lock:
+                SimConnectDLL.SimConnect_WeatherSetModeCustom(self.hSimConnect)
+                result = SimConnectDLL.SimConnect_WeatherSetObservation(self.hSimConnect, _C_SECONDS_IMMEDIATE, metar_bytes)
+            self._request_dispatch()
             if result == 0:
-                logger.info(f"Raw METAR injection succeeded: {metar}")
+                logger.info("Raw METAR injection succeeded: %s", metar)
                 return True
-            logger.error(f"SimConnect_WeatherSetObservation failed for raw METAR. Error: {result}")
+            logger.error("SimConnect_WeatherSetObservation failed for raw METAR. Error: %s", result)
             return False
         except Exception as e:
-            logger.error(f"Error injecting raw METAR: {e}")
+            logger.error("Error injecting raw METAR: %s", e)
             self.connected = False
             return False
     
-    def _build_metar_string(self, weather: WeatherState, lat: Optional[float] = None, lon: Optional[float] = None, station_icao: Optional[str] = None) -> Optional[str]:
-        """Build a METAR string from weather state for SimConnect.
+    def _build_metar_string(self, weather: WeatherState, lat: Optional[float] = None, lon: Optional[float] = None, station_icao: Optional[str] = None) -> Optional[bytes]:
+        """Build an encoded METAR from weather state for SimConnect.
         
         Format for global weather: GLOB DDHHMMZ dddssKT vis clouds temp/dew pressure
         Example: GLOB 030405Z 27007KT 9999 SKC 17/13 Q1013
@@ -975,140 +1248,32 @@ class SimConnectInjector(WeatherInjector):
             lat: Latitude (unused, kept for compatibility)
             lon: Longitude (unused, kept for compatibility)
             station_icao: Station ICAO code. If provided, uses station format. If None, uses global format.
-        """
-        from datetime import datetime
-        
-        # Build METAR components - SimConnect format
-        parts = []
         
+        Returns:
+            ASCII METAR bytes (without null terminator)
+        """
         # Station identifier: use ICAO METAR for station, or GLOB for global.
         # Some FSX builds behave better with station injection than GLOB.
         if station_icao:
-            parts.append(station_icao.upper())
-            parts.append("METAR")
+            header = _station_header(station_icao)
         else:
-            parts.append("GLOB")
+            header = b"GLOB"
         
-        # Date/time (format: DDHHMMZ) - use current UTC time
-        now = datetime.utcnow()
-        date_time = now.strftime("%d%H%MZ")
-        parts.append(date_time)
+        # Validate minimum visibility (400 meters = ICAO minimum)
+        if weather.visibility_nm is not None and weather.visibility_nm * 1852 < 400:
+            logger.warning("Visibility %s nm (%.0fm) is below minimum, using 400m", weather.visibility_nm, weather.visibility_nm * 1852)
         
-        # Wind. Avoid 000ddKT when speed>=10 (calm direction at high speed edge case);
-        # use 090ddKT instead (e.g. 09050KT).
-        if weather.wind_dir_deg is not None and weather.wind_speed_kt is not None:
-            wind_dir = int(weather.wind_dir_deg) % 360
-            wind_speed = int(weather.wind_speed_kt)
-            if wind_speed >= 10 and wind_dir == 0:
-                wind_dir = 90
-            if wind_speed == 0:
-                parts.append("00000KT")
-            else:
-                parts.append(f"{wind_dir:03d}{wind_speed:02d}KT")
-                if weather.wind_gust_kt is not None and weather.wind_gust_kt > weather.wind_speed_kt:
-                    gust = int(weather.wind_gust_kt)
-                    parts[-1] = f"{wind_dir:03d}{wind_speed:02d}G{gust:02d}KT"
-        else:
-            parts.append("00000KT")
-        
-        # Visibility - SimConnect format: use ICAO-style meter steps
-        # Best practice: convert to meters and use ICAO steps (8000, 5000, 3000, 1600, 800, 400)
-        # If visibility >= 10 km, use "9999"
-        if weather.visibility_nm is not None:
-            vis = weather.visibility_nm
-            # Convert to meters (1 nm = 1852 meters)
-            vis_m = vis * 1852
-            
-            # Validate minimum visibility (400 meters = ICAO minimum)
-            if vis_m < 400:
-                logger.warning(f"Visibility {vis} nm ({vis_m:.0f}m) is below minimum, using 400m")
-                vis_m = 400
-            
-            if vis_m >= 10000:
-                # >= 10 km: use "9999" (unlimited visibility)
-                parts.append("9999")
-            else:
-                # Clamp to ICAO-style steps: 8000, 5000, 3000, 1600, 800, 400
-                if vis_m >= 8000:
-                    vis_value = 8000
-                elif vis_m >= 5000:
-                    vis_value = 5000
-                elif vis_m >= 3000:
-                    vis_value = 3000
-                elif vis_m >= 1600:
-                    vis_value = 1600
-                elif vis_m >= 800:
-                    vis_value = 800
-                else:
-                    vis_value = 400
-                
-                # Format as 4-digit meters (e.g., "8000", "0500")
-                parts.append(f"{vis_value:04d}")
-        else:
-            parts.append("9999")  # Default: unlimited visibility
-        
-        # Weather phenomena (simplified)
-        if weather.weather_tokens:
-            # Map common weather tokens to METAR codes
-            wx_codes = []
-            for token in weather.weather_tokens:
-                if "RA" in token.upper():
-                    wx_codes.append("RA")
-                elif "SN" in token.upper():
-                    wx_codes.append("SN")
-                elif "FG" in token.upper():
-                    wx_codes.append("FG")
-            if wx_codes:
-                parts.append("".join(wx_codes[:2]))  # Max 2 weather codes
-        
-        # Clouds. OVC000/BKN000 etc. are often treated as invalid in FSX; use minimum 005 (500 ft).
-        if weather.clouds:
-            cloud_parts = []
-            for cloud in weather.clouds[:3]:  # Max 3 cloud layers
-                if isinstance(cloud, dict):
-                    coverage = cloud.get('coverage', 'SCT')
-                    base_ft = cloud.get('base_ft', 3000)
-                    base_100ft = max(5, int(base_ft / 100))  # min 500 ft -> OVC005
-                    cov_map = {
-                        'FEW': 'FEW', 'SCT': 'SCT', 'BKN': 'BKN', 'OVC': 'OVC', 'CLR': 'SKC'
-                    }
-                    cov_code = cov_map.get(coverage, 'SCT')
-                    cloud_parts.append(f"{cov_code}{base_100ft:03d}")
-            if cloud_parts:
-                parts.extend(cloud_parts)
-        else:
-            parts.append("SKC")
-        
-        # Temperature and dewpoint
-        if weather.temperature_c is not None:
-            temp = int(weather.temperature_c)
-            dewp = int(weather.dewpoint_c) if weather.dewpoint_c is not None else temp - 5
-            parts.append(f"{temp:02d}/{dewp:02d}")
-        
-        # QNH (pressure) - SimConnect accepts both Q#### (hPa) and A#### (inHg)
-        # Use Q#### format (hPa) as it's more direct
-        if weather.qnh_hpa is not None:
-            qnh_hpa = weather.qnh_hpa
-            # Validate QNH range (normal: 950-1050 hPa, extreme: 870-1080 hPa)
-            if qnh_hpa < 870 or qnh_hpa > 1080:
-                logger.warning(f"QNH value {qnh_hpa} hPa is out of normal range, using default 1013 hPa")
-                qnh_hpa = 1013.25  # Standard sea level pressure
-            # Format: Q followed by hPa value (e.g., Q1013)
-            parts.append(f"Q{int(round(qnh_hpa))}")
-        else:
-            # Default QNH if missing
-            parts.append("Q1013")  # Standard sea level pressure
-        
-        # Build final METAR
-        metar = " ".join(parts)
-        return metar
+        return _build_weather_state_metar(header, weather)
     
     def disconnect(self):
         """Disconnect from SimConnect."""
         if self.connected and self.hSimConnect:
+            # Stop the dispatch loop before the handle is closed under it
+            self.connected = False
+            self._dispatch_wake.set()
             try:
-                SimConnectDLL.SimConnect_Close(self.hSimConnect)
+                with self._dispatch_lock:
+                    SimConnectDLL.SimConnect_Close(self.hSimConnect)
             except:
                 pass
-            self.connected = False
             logger.info("Disconnected from SimConnect")
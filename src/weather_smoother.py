@@ -1,13 +1,50 @@
 """Weather smoothing engine for gradual transitions."""
 
-from typing import Dict, Optional
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from src.config import SmoothingConfig
 
+logger = logging.getLogger(__name__)
+
+
+class WeatherCloud(NamedTuple):
+    """A cloud layer of a weather state."""
+    
+    coverage: str  # FEW, SCT, BKN, OVC
+    base_ft: Optional[float]  # Base altitude in feet
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "WeatherCloud":
+        """Create from a cloud dictionary (as produced by CloudLayer/TAFCloud.to_dict)."""
+        return cls(data.get("coverage", "SCT"), data.get("base_ft", 3000))
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "coverage": self.coverage,
+            "base_ft": self.base_ft,
+        }
+
 
 class WeatherState:
     """Current weather state (last injected)."""
     
+    # One is built per smooth() call; slots avoid a per-instance __dict__
+    __slots__ = (
+        "wind_dir_deg",
+        "wind_speed_kt",
+        "wind_gust_kt",
+        "visibility_nm",
+        "temperature_c",
+        "dewpoint_c",
+        "qnh_hpa",
+        "clouds",
+        "weather_tokens",
+        "is_big_change",
+        "is_very_big_change",
+    )
+    
     def __init__(self):
         self.wind_dir_deg: Optional[float] = None
         self.wind_speed_kt: Optional[float] = None
@@ -16,7 +53,7 @@ class WeatherState:
         self.temperature_c: Optional[float] = None
         self.dewpoint_c: Optional[float] = None
         self.qnh_hpa: Optional[float] = None
-        self.clouds: list = []
+        self.clouds: list[WeatherCloud] = []
         self.weather_tokens: list[str] = []
         # Metadata about the smoothing operation
         self.is_big_change: bool = False
@@ -32,7 +69,7 @@ class WeatherState:
             "temperature_c": self.temperature_c,
             "dewpoint_c": self.dewpoint_c,
             "qnh_hpa": self.qnh_hpa,
-            "clouds": self.clouds,
+            "clouds": [c.to_dict() for c in self.clouds],
             "weather_tokens": self.weather_tokens,
         }
     
@@ -45,7 +82,7 @@ class WeatherState:
         self.temperature_c = data.get("temperature_c")
         self.dewpoint_c = data.get("dewpoint_c")
         self.qnh_hpa = data.get("qnh_hpa")
-        self.clouds = data.get("clouds", [])
+        self.clouds = [WeatherCloud.from_dict(c) for c in data.get("clouds", []) if isinstance(c, dict)]
         self.weather_tokens = data.get("weather_tokens", [])
 
 
@@ -57,6 +94,38 @@ class WeatherSmoother:
         self.current_state = WeatherState()
         self.frozen = False
         self.freeze_altitude_ft: Optional[float] = None
+        # Per-step limits (wind dir, wind speed, QNH, visibility) for normal, big and
+        # very big changes, rebuilt if self.config is replaced
+        self._limits_config: Optional[SmoothingConfig] = None
+        self._limits: Tuple[Tuple[float, float, float, float], ...] = ()
+    
+    def _build_limits(self) -> None:
+        """Precompute the smoothing limits for the current config."""
+        config = self.config
+        if config.transition_mode == "time_based":
+            # Time-based mode: use step sizes per transition interval
+            # Example: visibility changes by 200m every 30-60 seconds
+            # Convert visibility step from meters to nautical miles
+            step = (
+                config.wind_dir_step_deg,
+                config.wind_speed_step_kt,
+                config.qnh_step_hpa,
+                config.visibility_step_m / 1852.0,
+            )
+            self._limits = (step, step, step)
+        else:
+            # Step-limited mode (original behavior): big changes move 10x faster,
+            # very big changes 50x (near-instant)
+            self._limits = tuple(
+                (
+                    config.max_wind_dir_change_deg * factor,
+                    config.max_wind_speed_change_kt * factor,
+                    config.max_qnh_change_hpa * factor,
+                    config.max_visibility_change * factor,
+                )
+                for factor in (1.0, 10.0, 50.0)
+            )
+        self._limits_config = config
     
     def set_freeze_altitude(self, altitude_ft: float) -> None:
         """Set current altitude for freeze logic."""
@@ -117,49 +186,19 @@ class WeatherSmoother:
             if vis_diff > 10.0:  # Very large visibility change (>10nm)
                 is_very_big_change = True
         
-        # Calculate effective smoothing limits based on transition mode
-        if self.config.transition_mode == "time_based":
-            # Time-based mode: use step sizes per transition interval
-            # Example: visibility changes by 200m every 30-60 seconds
-            # Convert visibility step from meters to nautical miles
-            visibility_step_nm = self.config.visibility_step_m / 1852.0  # meters to nm
-            
-            wind_dir_limit = self.config.wind_dir_step_deg
-            wind_speed_limit = self.config.wind_speed_step_kt
-            qnh_limit = self.config.qnh_step_hpa
-            visibility_limit = visibility_step_nm
-            
-            import logging
-            logger = logging.getLogger(__name__)
-            if is_very_big_change or is_big_change:
+        # Effective smoothing limits based on transition mode and change size
+        if self._limits_config is not self.config:
+            self._build_limits()
+        wind_dir_limit, wind_speed_limit, qnh_limit, visibility_limit = self._limits[
+            2 if is_very_big_change else 1 if is_big_change else 0
+        ]
+        if is_very_big_change or is_big_change:
+            if self.config.transition_mode == "time_based":
                 logger.info(f"Time-based transition: wind={wind_speed_limit:.1f}kt, vis={self.config.visibility_step_m:.0f}m, dir={wind_dir_limit:.1f}° per {self.config.transition_interval_seconds:.0f}s interval")
-        else:
-            # Step-limited mode (original behavior)
-            if is_very_big_change:
-                # For very big changes, allow near-instant transitions (50x normal rate)
-                wind_dir_limit = self.config.max_wind_dir_change_deg * 50.0
-                wind_speed_limit = self.config.max_wind_speed_change_kt * 50.0
-                qnh_limit = self.config.max_qnh_change_hpa * 50.0
-                visibility_limit = self.config.max_visibility_change * 50.0
-                
-                import logging
-                logger = logging.getLogger(__name__)
+            elif is_very_big_change:
                 logger.info(f"Very large weather change detected - using near-instant smoothing: wind={wind_speed_limit:.1f}kt/cycle, vis={visibility_limit:.1f}nm/cycle")
-            elif is_big_change:
-                # For big changes, allow much faster transitions (10x normal rate)
-                wind_dir_limit = self.config.max_wind_dir_change_deg * 10.0
-                wind_speed_limit = self.config.max_wind_speed_change_kt * 10.0
-                qnh_limit = self.config.max_qnh_change_hpa * 10.0
-                visibility_limit = self.config.max_visibility_change * 10.0
-                
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"Big weather change detected - using faster smoothing: wind={wind_speed_limit:.1f}kt/cycle, vis={visibility_limit:.1f}nm/cycle")
             else:
-                wind_dir_limit = self.config.max_wind_dir_change_deg
-                wind_speed_limit = self.config.max_wind_speed_change_kt
-                qnh_limit = self.config.max_qnh_change_hpa
-                visibility_limit = self.config.max_visibility_change
+                logger.info(f"Big weather change detected - using faster smoothing: wind={wind_speed_limit:.1f}kt/cycle, vis={visibility_limit:.1f}nm/cycle")
         
         # Smooth wind direction
         smoothed.wind_dir_deg = self._smooth_wind_dir(
@@ -227,9 +266,7 @@ class WeatherSmoother:
             # If no wind/vis check passed, check if any other parameter is still far
             if not still_transitioning_very_big:
                 if (smoothed.wind_dir_deg is not None and target.get("wind_dir_deg") is not None):
-                    wind_dir_diff = abs(target["wind_dir_deg"] - smoothed.wind_dir_deg)
-                    if wind_dir_diff > 180:
-                        wind_dir_diff = 360 - wind_dir_diff
+                    wind_dir_diff = abs((target["wind_dir_deg"] - smoothed.wind_dir_deg + 180.0) % 360.0 - 180.0)
                     if wind_dir_diff > 30.0:  # Still more than 30° away
                         still_transitioning_very_big = True
         
@@ -246,9 +283,7 @@ class WeatherSmoother:
             # If no wind/vis check passed, check if any other parameter is still far
             if not still_transitioning_big:
                 if (smoothed.wind_dir_deg is not None and target.get("wind_dir_deg") is not None):
-                    wind_dir_diff = abs(target["wind_dir_deg"] - smoothed.wind_dir_deg)
-                    if wind_dir_diff > 180:
-                        wind_dir_diff = 360 - wind_dir_diff
+                    wind_dir_diff = abs((target["wind_dir_deg"] - smoothed.wind_dir_deg + 180.0) % 360.0 - 180.0)
                     if wind_dir_diff > 15.0:  # Still more than 15° away
                         still_transitioning_big = True
         
@@ -282,8 +317,6 @@ class WeatherSmoother:
         try:
             target = float(target)
         except (ValueError, TypeError):
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"_smooth_wind_dir: target is not a number: {target} (type: {type(target)})")
             return current
         
@@ -291,8 +324,6 @@ class WeatherSmoother:
         try:
             current = float(current)
         except (ValueError, TypeError):
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"_smooth_wind_dir: current is not a number: {current} (type: {type(current)})")
             return target
         
@@ -309,16 +340,9 @@ class WeatherSmoother:
         if abs(diff) > max_change:
             diff = max_change if diff > 0 else -max_change
         
-        # Apply change
-        result = current + diff
-        
-        # Normalize to 0-360
-        while result < 0:
-            result += 360
-        while result >= 360:
-            result -= 360
-        
-        return result
+        # Apply change and normalize to 0-360 (a tiny negative sum rounds up to 360.0 under %)
+        result = (current + diff) % 360.0
+        return 0.0 if result == 360.0 else result
     
     def _smooth_value(
         self,
@@ -327,9 +351,6 @@ class WeatherSmoother:
         max_change: float,
     ) -> Optional[float]:
         """Smooth a numeric value."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         if target is None:
             return current
         if current is None:
@@ -367,10 +388,20 @@ class WeatherSmoother:
         current: list,
         target: list,
     ) -> list:
-        """Smooth cloud layers (simplified)."""
+        """Smooth cloud layers (simplified).
+        
+        Args:
+            current: Current WeatherCloud layers
+            target: Target cloud dictionaries
+        
+        Returns:
+            New list of WeatherCloud layers
+        """
         # For now, just use target clouds
         # More sophisticated smoothing could be added later
-        return target.copy() if target else current.copy()
+        if not target:
+            return current.copy()
+        return [WeatherCloud.from_dict(c) for c in target if isinstance(c, dict)]
     
     def _is_big_change(self, target: Dict) -> bool:
         """Check if target represents a big change that should break freeze or use faster smoothing."""
@@ -384,9 +415,7 @@ class WeatherSmoother:
         
         # Check wind direction change
         if self.current_state.wind_dir_deg is not None and target.get("wind_dir_deg") is not None:
-            diff = abs(target["wind_dir_deg"] - self.current_state.wind_dir_deg)
-            if diff > 180:
-                diff = 360 - diff
+            diff = abs((target["wind_dir_deg"] - self.current_state.wind_dir_deg + 180.0) % 360.0 - 180.0)
             if diff > self.config.big_change_wind_deg:
                 big_change_detected = True
         
@@ -418,7 +447,7 @@ class WeatherSmoother:
         if current_has_clouds != target_has_clouds:
             # Check if it's a significant cloud change (e.g., OVC to SKC)
             if current_has_clouds:
-                current_max_coverage = max((c.get('coverage', '') for c in self.current_state.clouds if isinstance(c, dict)), default='')
+                current_max_coverage = max((c.coverage for c in self.current_state.clouds), default='')
                 if current_max_coverage in ['OVC', 'BKN']:
                     big_change_detected = True
             elif target_has_clouds:
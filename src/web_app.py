@@ -3,12 +3,13 @@
 import asyncio
 import json
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -113,6 +114,8 @@ engine: Optional[WeatherEngine] = None
 config: Optional[AppConfig] = None
 update_task: Optional[asyncio.Task] = None
 websocket_clients: List[WebSocket] = []
+# Set by the startup event once the engine exists; main() waits on it
+engine_ready = threading.Event()
 
 # Simple in-memory cache for API responses
 class APICache:
@@ -265,6 +268,7 @@ async def startup():
     
     # Initialize engine (this will load persisted data)
     engine = WeatherEngine(config)
+    engine_ready.set()
     logger.info("WeatherEngine created successfully")
     
     # Download full data on startup if needed
@@ -315,7 +319,7 @@ async def download_full_data_on_startup():
                             name=station_dict.get("name", ""),
                             country=station_dict.get("country", ""),
                         )
-                        engine.station_db.stations[station.icao] = station
+                        engine.station_db.add_station(station)
                     except Exception as e:
                         logger.warning(f"Error adding station {station_dict.get('icao', 'unknown')}: {e}")
                 logger.info(f"Updated station database with {len(stations)} stations")
@@ -349,7 +353,7 @@ async def download_full_data_on_startup():
                             name=station_dict.get("name", ""),
                             country=station_dict.get("country", ""),
                         )
-                        engine.station_db.stations[station.icao] = station
+                        engine.station_db.add_station(station)
                     except Exception as e:
                         logger.warning(f"Error updating station {station_dict.get('icao', 'unknown')}: {e}")
                 logger.info(f"Enhanced station names from local cache (background task will update missing names later)")
@@ -588,7 +592,8 @@ async def get_stations():
     if not engine:
         raise HTTPException(status_code=503, detail="Engine not initialized")
     
-    return engine.station_db.to_geojson()
+    # Pre-serialized to skip FastAPI's per-object encoding of thousands of features
+    return Response(content=engine.station_db.to_geojson_bytes(), media_type="application/json")
 
 
 @app.get("/api/weather/availability")
@@ -853,7 +858,7 @@ async def refresh_stations():
                         name=station_dict.get("name", ""),
                         country=station_dict.get("country", ""),
                     )
-                    engine.station_db.stations[station.icao] = station
+                    engine.station_db.add_station(station)
                 except Exception as e:
                     logger.warning(f"Error adding station {station_dict.get('icao', 'unknown')}: {e}")
             logger.info(f"Updated station database with {len(stations)} stations")
@@ -999,6 +1004,7 @@ async def enhance_station_names():
                     new_country = station_dict.get("country", "")
                     if new_country and new_country != "Unknown":
                         engine.station_db.stations[icao].country = new_country
+        engine.station_db.invalidate()
         
         # Save enhanced stations to file
         engine.data_manager.save_stations(enhanced_stations)
@@ -1114,7 +1120,7 @@ async def test_weather_injection(
         station_icao: Optional station ICAO code for station-specific injection
     """
     try:
-        from src.weather_smoother import WeatherState
+        from src.weather_smoother import WeatherCloud, WeatherState
         
         # Create test weather state
         test_weather = WeatherState()
@@ -1131,11 +1137,7 @@ async def test_weather_injection(
         test_weather.clouds = []
         if cloud_coverage != "SKC" and cloud_base_ft < cloud_top_ft:
             # Create a single overcast layer from base to top
-            test_weather.clouds.append({
-                "coverage": cloud_coverage,
-                "base_ft": float(cloud_base_ft),
-                "top_ft": float(cloud_top_ft),
-            })
+            test_weather.clouds.append(WeatherCloud(cloud_coverage, float(cloud_base_ft)))
         
         # Get aircraft position if available
         aircraft_lat = None
@@ -1208,7 +1210,7 @@ async def test_weather_injection(
         raise HTTPException(status_code=503, detail="Engine not initialized")
     
     try:
-        from src.weather_smoother import WeatherState
+        from src.weather_smoother import WeatherCloud, WeatherState
         
         # Create test weather state
         test_weather = WeatherState()
@@ -1225,10 +1227,7 @@ async def test_weather_injection(
         test_weather.clouds = []
         if cloud_coverage != "SKC":
             # Create a single cloud layer at the specified base
-            test_weather.clouds.append({
-                "coverage": cloud_coverage,
-                "base_ft": float(cloud_base_ft),
-            })
+            test_weather.clouds.append(WeatherCloud(cloud_coverage, float(cloud_base_ft)))
         
         # Get aircraft position if available
         aircraft_lat = None
@@ -44,6 +44,19 @@ class TestMETARParser(unittest.TestCase):
         self.assertEqual(metar.clouds[1].coverage, "OVC")
         self.assertEqual(metar.clouds[1].base_ft, 6000)
     
+    def test_parse_metar_with_terminator(self):
+        """Test parsing METAR ending with the ICAO '=' terminator."""
+        metar = parse_metar("EGLL 121150Z 24010KT 9999 -RA BKN012 OVC030 08/06 Q1013=")
+        
+        self.assertEqual(metar.qnh_hpa, 1013.0)
+        self.assertEqual(metar.temperature_c, 8.0)
+        self.assertEqual(metar.weather_tokens, ["RA"])
+        self.assertTrue(metar.valid)
+        
+        metar = parse_metar("EGLL 121150Z 24010KT 9999 BKN012 Q1013 08/06=")
+        self.assertEqual(metar.temperature_c, 8.0)
+        self.assertEqual(metar.dewpoint_c, 6.0)
+    
     def test_parse_invalid_metar(self):
         """Test parsing invalid METAR."""
         raw = "INVALID METAR STRING"
@@ -1,5 +1,6 @@
 """Tests for station database."""
 
+import json
 import unittest
 from pathlib import Path
 
@@ -60,3 +61,65 @@ class TestStations(unittest.TestCase):
             # Results should be sorted by distance
             for i in range(len(results) - 1):
                 self.assertLessEqual(results[i][1], results[i + 1][1])
+    
+    def test_find_nearest_stations_in_memory(self):
+        """Test nearest station search against a brute-force scan."""
+        db = StationDatabase(Path(__file__).parent / "no_such_stations.csv")
+        db.add_station(Station("KJFK", 40.6398, -73.7789, "JFK", "US"))
+        db.add_station(Station("KLGA", 40.7769, -73.8740, "LGA", "US"))
+        db.add_station(Station("KEWR", 40.6925, -74.1687, "EWR", "US"))
+        db.add_station(Station("KLAX", 33.9425, -118.4081, "LAX", "US"))
+        # Either side of the antimeridian and near the pole
+        db.add_station(Station("NFFN", -17.7554, 177.4434, "Nadi", "FJ"))
+        db.add_station(Station("NSTU", -14.3310, -170.7110, "Pago Pago", "AS"))
+        db.add_station(Station("BGTL", 76.5312, -68.7032, "Thule", "GL"))
+        
+        queries = [
+            (40.7128, -74.0060, 50.0),
+            (-16.0, 179.9, 600.0),
+            (89.0, 100.0, 900.0),
+            (0.0, 0.0, 100.0),
+        ]
+        for lat, lon, radius_nm in queries:
+            expected = sorted(
+                (s.distance_to(lat, lon), s.icao)
+                for s in db.stations.values()
+                if s.distance_to(lat, lon) <= radius_nm
+            )[:3]
+            results = db.find_nearest_stations(lat, lon, radius_nm=radius_nm, max_results=3, fallback_to_global=False)
+            self.assertEqual([s.icao for s, _ in results], [icao for _, icao in expected])
+            for (_, distance), (expected_distance, _) in zip(results, expected):
+                self.assertAlmostEqual(distance, expected_distance, places=6)
+        
+        # Nothing within 100nm of 0,0 - fall back to the globally nearest station
+        results = db.find_nearest_stations(0.0, 0.0, radius_nm=100.0, max_results=1)
+        self.assertEqual(len(results), 1)
+    
+    def test_geojson_cache_invalidation(self):
+        """Test cached GeoJSON is rebuilt when a station is added."""
+        db = StationDatabase(Path(__file__).parent / "no_such_stations.csv")
+        db.add_station(Station("KJFK", 40.6398, -73.7789, "JFK", "US"))
+        
+        geojson = db.to_geojson()
+        self.assertIs(db.to_geojson(), geojson)
+        self.assertEqual(json.loads(db.to_geojson_bytes()), geojson)
+        
+        db.add_station(Station("KLAX", 33.9425, -118.4081, "LAX", "US"))
+        geojson = db.to_geojson()
+        self.assertEqual([f["properties"]["icao"] for f in geojson["features"]], ["KJFK", "KLAX"])
+        self.assertEqual(json.loads(db.to_geojson_bytes()), geojson)
+        
+        db.stations["KLAX"].name = "Los Angeles"
+        db.invalidate()
+        self.assertEqual(json.loads(db.to_geojson_bytes())["features"][1]["properties"]["name"], "Los Angeles")
+    
+    def test_replaced_station_invalidates_cache(self):
+        """Test replacing a station refreshes the index and GeoJSON."""
+        db = StationDatabase(Path(__file__).parent / "no_such_stations.csv")
+        db.add_station(Station("KJFK", 40.6398, -73.7789, "JFK", "US"))
+        self.assertEqual(db.find_nearest_stations(40.6, -73.8, radius_nm=10.0)[0][0].name, "JFK")
+        db.to_geojson()
+        
+        db.add_station(Station("KJFK", 40.6413, -73.7781, "John F Kennedy Intl", "US"))
+        self.assertEqual(db.find_nearest_stations(40.6, -73.8, radius_nm=10.0)[0][0].name, "John F Kennedy Intl")
+        self.assertEqual(db.to_geojson()["features"][0]["properties"]["name"], "John F Kennedy Intl")
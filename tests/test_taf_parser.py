@@ -0,0 +1,61 @@
+"""Tests for TAF parser."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from src.taf_parser import parse_taf, parse_taf_date
+
+
+class TestTAFParser(unittest.TestCase):
+    """Test TAF parser."""
+    
+    def test_parse_taf_date(self):
+        """Test parsing TAF dates relative to a base date."""
+        base = datetime(2024, 3, 16, 12, 30)
+        
+        self.assertEqual(parse_taf_date("161800Z", base), datetime(2024, 3, 16, 18, 0))
+        self.assertIsNone(parse_taf_date("1618Z", base))
+        self.assertIsNone(parse_taf_date("AB1800Z", base))
+    
+    def test_parse_taf_date_month_rollover(self):
+        """Test TAF dates far from the base date roll into the adjacent month."""
+        # Late in the month, early days belong to the next month
+        self.assertEqual(parse_taf_date("010600Z", datetime(2024, 12, 30, 12, 0)), datetime(2025, 1, 1, 6, 0))
+        # Early in the month, late days belong to the previous month
+        self.assertEqual(parse_taf_date("291200Z", datetime(2024, 3, 1, 0, 0)), datetime(2024, 2, 29, 12, 0))
+        self.assertIsNone(parse_taf_date("301200Z", datetime(2023, 3, 1, 0, 0)))
+    
+    def test_parse_taf_valid_period(self):
+        """Test issue time and valid period are filled in for both period formats."""
+        day = datetime.utcnow().day
+        
+        taf = parse_taf(f"TAF KJFK {day:02d}1130Z {day:02d}1200/{day:02d}1800Z 12015KT P6SM")
+        self.assertTrue(taf.valid)
+        self.assertEqual((taf.issue_time.day, taf.issue_time.hour, taf.issue_time.minute), (day, 11, 30))
+        self.assertEqual((taf.valid_from.day, taf.valid_from.hour), (day, 12))
+        self.assertEqual((taf.valid_to.day, taf.valid_to.hour), (day, 18))
+        
+        taf = parse_taf(f"TAF SBGR {day:02d}1100Z {day:02d}12/{day:02d}24 12010KT 9999 TEMPO {day:02d}14/{day:02d}18 4000 RA")
+        self.assertTrue(taf.valid)
+        self.assertEqual((taf.issue_time.day, taf.issue_time.hour), (day, 11))
+        self.assertEqual((taf.valid_from.day, taf.valid_from.hour), (day, 12))
+        self.assertEqual(taf.valid_to, taf.valid_from.replace(hour=0) + timedelta(days=1))
+    
+    def test_parse_taf_fm_groups(self):
+        """Test parsing prevailing wind and FM groups."""
+        raw = "TAF KJFK 121130Z 121200/131800Z 12015KT P6SM FM121800Z 15020G30KT FM130000Z VRB05KT 3SM BR"
+        taf = parse_taf(raw)
+        
+        self.assertEqual(taf.icao, "KJFK")
+        self.assertEqual(taf.prevailing.wind_dir_deg, 120)
+        self.assertEqual(taf.prevailing.wind_speed_kt, 15.0)
+        
+        self.assertEqual(len(taf.groups), 2)
+        self.assertEqual(taf.groups[0].wind_dir_deg, 150)
+        self.assertEqual(taf.groups[0].wind_gust_kt, 30.0)
+        self.assertIsNone(taf.groups[1].wind_dir_deg)
+        self.assertEqual(taf.groups[1].wind_speed_kt, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
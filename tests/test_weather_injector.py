@@ -0,0 +1,60 @@
+"""Tests for weather injection."""
+
+import unittest
+from unittest import mock
+
+from src import weather_injector
+from src.metar_parser import parse_metar
+
+
+class FakeBridge:
+    """FSUIPC bridge stand-in that records prepared 0xB000 writes."""
+    
+    def __init__(self):
+        self.connection = mock.MagicMock()
+        self.writes = self.connection.prepare_data.return_value.write
+    
+    def is_connected(self):
+        return True
+
+
+class TestFSUIPCDuplicateWrites(unittest.TestCase):
+    """Test skipping of unchanged FSUIPC METAR writes."""
+    
+    def setUp(self):
+        self.bridge = FakeBridge()
+        with mock.patch.object(weather_injector, "FSUIPC_AVAILABLE", True):
+            self.injector = weather_injector.FSUIPCWeatherInjector(self.bridge)
+        self.stations = [("EGLL", parse_metar("EGLL 121150Z 24010KT 9999 BKN012 08/06 Q1013"), 0.0)]
+    
+    def inject_at(self, wall_time, monotonic_time):
+        clock = weather_injector.time
+        with mock.patch.object(clock, "time", return_value=wall_time), \
+                mock.patch.object(clock, "monotonic", return_value=monotonic_time), \
+                mock.patch.object(clock, "sleep"):
+            return self.injector.inject_station_metars(self.stations)
+    
+    def test_unchanged_weather_skipped_across_minute_boundary(self):
+        """Test the time group in the METAR does not defeat the duplicate check."""
+        minute_start = 1_700_000_040.0
+        self.assertTrue(self.inject_at(minute_start + 55, 1000.0))
+        self.assertTrue(self.inject_at(minute_start + 65, 1010.0))
+        self.assertEqual(self.bridge.writes.call_count, 1)
+    
+    def test_unchanged_weather_rewritten_after_interval(self):
+        """Test unchanged weather is still rewritten periodically."""
+        self.assertTrue(self.inject_at(1_700_000_000.0, 1000.0))
+        later = 1000.0 + weather_injector._FSUIPC_REWRITE_INTERVAL_SECONDS
+        self.assertTrue(self.inject_at(1_700_000_000.0 + 300, later))
+        self.assertEqual(self.bridge.writes.call_count, 2)
+    
+    def test_changed_weather_written(self):
+        """Test a new METAR for the station is written straight away."""
+        self.assertTrue(self.inject_at(1_700_000_000.0, 1000.0))
+        self.stations = [("EGLL", parse_metar("EGLL 121220Z 24015KT 9999 BKN012 08/06 Q1012"), 0.0)]
+        self.assertTrue(self.inject_at(1_700_000_010.0, 1010.0))
+        self.assertEqual(self.bridge.writes.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()